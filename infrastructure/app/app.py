@@ -12,6 +12,12 @@ from streamlit.logger import get_logger
 logger = get_logger(__name__)
 logger.setLevel("INFO")
 
+# Use orjson for decoding agent responses when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 # Page config
 st.set_page_config(
     page_title="Bedrock AgentCore Chat",
@@ -34,48 +40,117 @@ st.markdown(
 HUMAN_AVATAR = "static/user-profile.svg"
 AI_AVATAR = "static/gen-ai-dark.svg"
 
+# Prefix of the tool banner frames sent by the agents
+TOOL_MARKER = "🔧 Using tool:"
+
+# Minimum seconds between re-renders of a streaming response
+STREAM_RENDER_INTERVAL = 0.1
+
+# Patterns used by clean_response_text, compiled once at import
+_QUOTED_CHUNK_RE = re.compile(r'"\s*"')
+_LEADING_QUOTE_RE = re.compile(r'^"')
+_TRAILING_QUOTE_RE = re.compile(r'"$')
+_MULTI_SPACE_RE = re.compile(r" {3,}")
+_NUMBERED_ITEM_RE = re.compile(r"\n(\d+)\.\s+")
+_LEADING_NUMBERED_ITEM_RE = re.compile(r"^(\d+)\.\s+")
+_BULLET_ITEM_RE = re.compile(r"\n-\s+")
+_LEADING_BULLET_ITEM_RE = re.compile(r"^-\s+")
+_SECTION_HEADER_RE = re.compile(r"\n([A-Za-z][A-Za-z\s]{2,30}):\s*\n")
+_MULTI_NEWLINE_RE = re.compile(r"\n{3,}")
+_THINKING_RE = re.compile(r"<thinking>.*?</thinking>")
+
+# Reuse connections and let botocore handle throttling for control-plane calls
+CONTROL_CLIENT_CONFIG = botocore.config.Config(
+    tcp_keepalive=True,
+    max_pool_connections=32,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    connect_timeout=5,
+    read_timeout=30,
+)
 
-def fetch_agent_runtimes(region: str = "us-west-2") -> List[Dict]:
-    """Fetch available agent runtimes from bedrock-agentcore-control"""
-    try:
-        client = boto3.client("bedrock-agentcore-control", region_name=region)
-        response = client.list_agent_runtimes(maxResults=100)
-
-        # Filter only READY agents and sort by name
-        ready_agents = [
+# How long agent runtime listings are reused before calling the API again
+AGENT_CACHE_TTL_SECONDS = 60
+
+
+@st.cache_resource
+def get_control_client(region: str):
+    """Return a cached bedrock-agentcore-control client for the region"""
+    return boto3.client(
+        "bedrock-agentcore-control",
+        region_name=region,
+        config=CONTROL_CLIENT_CONFIG,
+    )
+
+
+@st.cache_resource
+def get_agentcore_client(region: str):
+    """Return a cached bedrock-agentcore client for the region"""
+    return boto3.client(
+        "bedrock-agentcore",
+        region_name=region,
+        config=botocore.config.Config(
+            read_timeout=900, connect_timeout=5, tcp_keepalive=True
+        ),
+    )
+
+
+@st.cache_data(ttl=AGENT_CACHE_TTL_SECONDS, show_spinner=False)
+def list_ready_agent_runtimes(region: str) -> List[Dict]:
+    """List READY agent runtimes for the region, cached across reruns"""
+    client = get_control_client(region)
+    pages = client.get_paginator("list_agent_runtimes").paginate(
+        PaginationConfig={"PageSize": 100}
+    )
+
+    # Filter only READY agents and sort by most recent update time (newest first)
+    return sorted(
+        (
             agent
-            for agent in response.get("agentRuntimes", [])
+            for page in pages
+            for agent in page.get("agentRuntimes", [])
             if agent.get("status") == "READY"
-        ]
+        ),
+        key=lambda x: x.get("lastUpdatedAt", ""),
+        reverse=True,
+    )
 
-        # Sort by most recent update time (newest first)
-        ready_agents.sort(key=lambda x: x.get("lastUpdatedAt", ""), reverse=True)
 
-        return ready_agents
+def fetch_agent_runtimes(region: str = "us-west-2") -> List[Dict]:
+    """Fetch available agent runtimes from bedrock-agentcore-control"""
+    try:
+        return list_ready_agent_runtimes(region)
     except Exception as e:
         st.error(f"Error fetching agent runtimes: {e}")
         return []
 
 
-def fetch_agent_runtime_versions(
-    agent_runtime_id: str, region: str = "us-west-2"
-) -> List[Dict]:
-    """Fetch versions for a specific agent runtime"""
-    try:
-        client = boto3.client("bedrock-agentcore-control", region_name=region)
-        response = client.list_agent_runtime_versions(agentRuntimeId=agent_runtime_id)
+@st.cache_data(ttl=AGENT_CACHE_TTL_SECONDS, show_spinner=False)
+def list_ready_agent_runtime_versions(agent_runtime_id: str, region: str) -> List[Dict]:
+    """List READY versions for an agent runtime, cached across reruns"""
+    client = get_control_client(region)
+    pages = client.get_paginator("list_agent_runtime_versions").paginate(
+        agentRuntimeId=agent_runtime_id
+    )
 
-        # Filter only READY versions
-        ready_versions = [
+    # Filter only READY versions and sort by most recent update time (newest first)
+    return sorted(
+        (
             version
-            for version in response.get("agentRuntimes", [])
+            for page in pages
+            for version in page.get("agentRuntimes", [])
             if version.get("status") == "READY"
-        ]
+        ),
+        key=lambda x: x.get("lastUpdatedAt", ""),
+        reverse=True,
+    )
 
-        # Sort by most recent update time (newest first)
-        ready_versions.sort(key=lambda x: x.get("lastUpdatedAt", ""), reverse=True)
 
-        return ready_versions
+def fetch_agent_runtime_versions(
+    agent_runtime_id: str, region: str = "us-west-2"
+) -> List[Dict]:
+    """Fetch versions for a specific agent runtime"""
+    try:
+        return list_ready_agent_runtime_versions(agent_runtime_id, region)
     except Exception as e:
         st.error(f"Error fetching agent runtime versions: {e}")
         return []
@@ -88,18 +163,18 @@ def clean_response_text(text: str, show_thinking: bool = True) -> str:
 
     # Handle the consecutive quoted chunks pattern
     # Pattern: "word1" "word2" "word3" -> word1 word2 word3
-    text = re.sub(r'"\s*"', "", text)
-    text = re.sub(r'^"', "", text)
-    text = re.sub(r'"$', "", text)
+    text = _QUOTED_CHUNK_RE.sub("", text)
+    text = _LEADING_QUOTE_RE.sub("", text)
+    text = _TRAILING_QUOTE_RE.sub("", text)
 
-    # Replace literal \n with actual newlines
-    text = text.replace("\\n", "\n")
-
-    # Replace literal \t with actual tabs
-    text = text.replace("\\t", "\t")
+    # Replace literal \n and \t with actual newlines and tabs; skip both
+    # passes when the text has no backslashes at all
+    if "\\" in text:
+        text = text.replace("\\n", "\n")
+        text = text.replace("\\t", "\t")
 
     # Clean up multiple spaces
-    text = re.sub(r" {3,}", " ", text)
+    text = _MULTI_SPACE_RE.sub(" ", text)
 
     # Fix newlines that got converted to spaces
     text = text.replace(" \n ", "\n")
@@ -107,23 +182,23 @@ def clean_response_text(text: str, show_thinking: bool = True) -> str:
     text = text.replace(" \n", "\n")
 
     # Handle numbered lists
-    text = re.sub(r"\n(\d+)\.\s+", r"\n\1. ", text)
-    text = re.sub(r"^(\d+)\.\s+", r"\1. ", text)
+    text = _NUMBERED_ITEM_RE.sub(r"\n\1. ", text)
+    text = _LEADING_NUMBERED_ITEM_RE.sub(r"\1. ", text)
 
     # Handle bullet points
-    text = re.sub(r"\n-\s+", r"\n- ", text)
-    text = re.sub(r"^-\s+", r"- ", text)
+    text = _BULLET_ITEM_RE.sub(r"\n- ", text)
+    text = _LEADING_BULLET_ITEM_RE.sub(r"- ", text)
 
     # Handle section headers
-    text = re.sub(r"\n([A-Za-z][A-Za-z\s]{2,30}):\s*\n", r"\n**\1:**\n\n", text)
+    text = _SECTION_HEADER_RE.sub(r"\n**\1:**\n\n", text)
 
     # Clean up multiple newlines
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _MULTI_NEWLINE_RE.sub("\n\n", text)
 
     # Clean up thinking
 
     if not show_thinking:
-        text = re.sub(r"<thinking>.*?</thinking>", "", text)
+        text = _THINKING_RE.sub("", text)
 
     return text.strip()
 
@@ -165,43 +240,29 @@ def extract_text_from_response(data) -> str:
 
 def parse_streaming_chunk(chunk: str) -> str:
     """Parse individual streaming chunk and extract meaningful content"""
-    logger.debug(f"parse_streaming_chunk: received chunk: {chunk}")
-    logger.debug(f"parse_streaming_chunk: chunk type: {type(chunk)}")
+    # Called for every streamed line, so log with lazy arguments that are only
+    # formatted when debug logging is enabled
+    logger.debug("parse_streaming_chunk: received chunk: %s", chunk)
+
+    # Most streamed chunks are JSON-encoded strings rather than objects, so
+    # return anything that can't be a JSON object before attempting a parse
+    if not chunk.lstrip().startswith("{"):
+        logger.debug("parse_streaming_chunk: Not JSON, returning as-is")
+        return chunk
 
     try:
         # Try to parse as JSON first
-        if chunk.strip().startswith("{"):
-            logger.debug("parse_streaming_chunk: Attempting JSON parse")
-            data = json.loads(chunk)
-            logger.debug(f"parse_streaming_chunk: Successfully parsed JSON: {data}")
-
-            # Handle the specific format: {'role': 'assistant', 'content': [{'text': '...'}]}
-            if isinstance(data, dict) and "role" in data and "content" in data:
-                content = data["content"]
-                if isinstance(content, list) and len(content) > 0:
-                    first_item = content[0]
-                    if isinstance(first_item, dict) and "text" in first_item:
-                        extracted_text = first_item["text"]
-                        logger.debug(
-                            f"parse_streaming_chunk: Extracted text: {extracted_text}"
-                        )
-                        return extracted_text
-                    else:
-                        return str(first_item)
-                else:
-                    return str(content)
-            else:
-                # Use the general extraction function for other formats
-                return extract_text_from_response(data)
+        logger.debug("parse_streaming_chunk: Attempting JSON parse")
+        data = json_loads(chunk)
+        logger.debug("parse_streaming_chunk: Successfully parsed JSON: %s", data)
 
-        # If not JSON, return the chunk as-is
-        logger.debug("parse_streaming_chunk: Not JSON, returning as-is")
-        return chunk
+        # Handles {'role': 'assistant', 'content': [{'text': '...'}]} and other formats
+        return extract_text_from_response(data)
     except json.JSONDecodeError as e:
         logger.error(f"parse_streaming_chunk: JSON decode error: {e}")
 
         # Try to handle Python dict string representation (with single quotes)
-        if chunk.strip().startswith("{") and "'" in chunk:
+        if "'" in chunk:
             logger.debug(
                 "parse_streaming_chunk: Attempting to handle Python dict string"
             )
@@ -209,28 +270,12 @@ def parse_streaming_chunk(chunk: str) -> str:
                 # Try to convert single quotes to double quotes for JSON parsing
                 # This is a simple approach - might need refinement for complex cases
                 json_chunk = chunk.replace("'", '"')
-                data = json.loads(json_chunk)
+                data = json_loads(json_chunk)
                 logger.debug(
                     f"parse_streaming_chunk: Successfully converted and parsed: {data}"
                 )
 
-                # Handle the specific format
-                if isinstance(data, dict) and "role" in data and "content" in data:
-                    content = data["content"]
-                    if isinstance(content, list) and len(content) > 0:
-                        first_item = content[0]
-                        if isinstance(first_item, dict) and "text" in first_item:
-                            extracted_text = first_item["text"]
-                            logger.debug(
-                                f"parse_streaming_chunk: Extracted text from converted dict: {extracted_text}"
-                            )
-                            return extracted_text
-                        else:
-                            return str(first_item)
-                    else:
-                        return str(content)
-                else:
-                    return extract_text_from_response(data)
+                return extract_text_from_response(data)
             except json.JSONDecodeError:
                 logger.debug(
                     "parse_streaming_chunk: Failed to convert Python dict string"
@@ -251,11 +296,7 @@ def invoke_agent_streaming(
 ) -> Iterator[str]:
     """Invoke agent and yield streaming response chunks"""
     try:
-        agentcore_client = boto3.client(
-            "bedrock-agentcore",
-            region_name=region,
-            config=botocore.config.Config(read_timeout=900, connect_timeout=5),
-        )
+        agentcore_client = get_agentcore_client(region)
 
         boto3_response = agentcore_client.invoke_agent_runtime(
             agentRuntimeArn=agent_arn,
@@ -270,23 +311,20 @@ def invoke_agent_streaming(
             logger.debug("Using streaming response path")
             # Handle streaming response
             for line in boto3_response["response"].iter_lines(chunk_size=1):
-                if line:
-                    line = line.decode("utf-8")
-                    logger.debug(f"Raw line: {line}")
-                    if line.startswith("data: "):
-                        line = line[6:]
-                        logger.debug(f"Line after removing 'data: ': {line}")
-                        # Parse and clean each chunk
-                        parsed_chunk = parse_streaming_chunk(line)
-                        if parsed_chunk.strip():  # Only yield non-empty chunks
-                            if "🔧 Using tool:" in parsed_chunk and not show_tool:
-                                yield ""
-                            else:
-                                yield parsed_chunk
-                    else:
-                        logger.debug(
-                            f"Line doesn't start with 'data: ', skipping: {line}"
-                        )
+                # Check the SSE prefix on the raw bytes and decode only the payload
+                if line.startswith(b"data: "):
+                    line = line[6:].decode("utf-8")
+                    logger.debug("Line after removing 'data: ': %s", line)
+                    # Parse and clean each chunk
+                    parsed_chunk = parse_streaming_chunk(line)
+                    if parsed_chunk.strip():  # Only yield non-empty chunks
+                        # Only scan for the tool banner when tools are hidden
+                        if not show_tool and TOOL_MARKER in parsed_chunk:
+                            yield ""
+                        else:
+                            yield parsed_chunk
+                elif line:
+                    logger.debug("Line doesn't start with 'data: ', skipping: %r", line)
         else:
             logger.debug("Using non-streaming response path")
             # Handle non-streaming JSON response
@@ -295,16 +333,15 @@ def invoke_agent_streaming(
                 logger.debug(f"response_obj type: {type(response_obj)}")
 
                 if hasattr(response_obj, "read"):
-                    # Read the response content
+                    # Read the response content; json_loads accepts the raw
+                    # bytes, so only decode when falling back to plain text
                     content = response_obj.read()
-                    if isinstance(content, bytes):
-                        content = content.decode("utf-8")
 
-                    logger.debug(f"Raw content: {content}")
+                    logger.debug(f"Raw content: {content!r}")
 
                     try:
                         # Try to parse as JSON and extract text
-                        response_data = json.loads(content)
+                        response_data = json_loads(content)
                         logger.debug(f"Parsed JSON: {response_data}")
 
                         # Handle the specific format we're seeing
@@ -316,36 +353,15 @@ def invoke_agent_streaming(
                                 actual_data = response_data
 
                             # Extract text from the nested structure
-                            if "role" in actual_data and "content" in actual_data:
-                                content_list = actual_data["content"]
-                                if (
-                                    isinstance(content_list, list)
-                                    and len(content_list) > 0
-                                ):
-                                    first_item = content_list[0]
-                                    if (
-                                        isinstance(first_item, dict)
-                                        and "text" in first_item
-                                    ):
-                                        extracted_text = first_item["text"]
-                                        logger.debug(
-                                            f"Extracted text: {extracted_text}"
-                                        )
-                                        yield extracted_text
-                                    else:
-                                        yield str(first_item)
-                                else:
-                                    yield str(content_list)
-                            else:
-                                # Use general extraction
-                                text = extract_text_from_response(actual_data)
-                                yield text
+                            yield extract_text_from_response(actual_data)
                         else:
                             yield str(response_data)
 
                     except json.JSONDecodeError as e:
                         logger.error(f"JSON decode error: {e}")
                         # If not JSON, yield raw content
+                        if isinstance(content, bytes):
+                            content = content.decode("utf-8")
                         yield content
                 elif isinstance(response_obj, dict):
                     # Direct dict response
@@ -387,13 +403,13 @@ def main():
             available_agents = fetch_agent_runtimes(region)
 
         if available_agents:
-            # Get unique agent names and their runtime IDs
+            # Get unique agent names and their runtime IDs (newest wins)
             unique_agents = {}
             for agent in available_agents:
-                name = agent.get("agentRuntimeName", "Unknown")
-                runtime_id = agent.get("agentRuntimeId", "")
-                if name not in unique_agents:
-                    unique_agents[name] = runtime_id
+                unique_agents.setdefault(
+                    agent.get("agentRuntimeName", "Unknown"),
+                    agent.get("agentRuntimeId", ""),
+                )
 
             # Create agent name options
             agent_names = list(unique_agents.keys())
@@ -474,6 +490,8 @@ def main():
                 "Agent ARN", value="", help="Enter your Bedrock AgentCore ARN manually"
             )
         if st.button("Refresh", key="refresh_agents", help="Refresh agent list"):
+            list_ready_agent_runtimes.clear()
+            list_ready_agent_runtime_versions.clear()
             st.rerun()
 
         # Runtime Session ID
@@ -559,7 +577,8 @@ def main():
         # Generate assistant response
         with st.chat_message("assistant", avatar=AI_AVATAR):
             message_placeholder = st.empty()
-            chunk_buffer = ""
+            chunks = []
+            last_render = 0.0
 
             try:
                 # Stream the response
@@ -571,8 +590,7 @@ def main():
                     show_tools,
                 ):
                     # Let's see what we get
-                    logger.debug(f"MAIN LOOP: chunk type: {type(chunk)}")
-                    logger.debug(f"MAIN LOOP: chunk content: {chunk}")
+                    logger.debug("MAIN LOOP: chunk content: %r", chunk)
 
                     # Ensure chunk is a string before concatenating
                     if not isinstance(chunk, str):
@@ -581,15 +599,15 @@ def main():
                         )
                         chunk = str(chunk)
 
-                    # Add chunk to buffer
-                    chunk_buffer += chunk
+                    # Collect chunks and join them only when rendering
+                    chunks.append(chunk)
 
-                    # Only update display every few chunks or when we hit certain characters
-                    if (
-                        len(chunk_buffer) % 3 == 0
-                        or chunk.endswith(" ")
-                        or chunk.endswith("\n")
-                    ):
+                    # Each update re-cleans and re-renders the whole response, so
+                    # only update the display every STREAM_RENDER_INTERVAL seconds
+                    now = time.monotonic()
+                    if now - last_render >= STREAM_RENDER_INTERVAL:
+                        last_render = now
+                        chunk_buffer = "".join(chunks)
                         if auto_format:
                             # Clean the accumulated response
                             cleaned_response = clean_response_text(
@@ -599,10 +617,9 @@ def main():
                         else:
                             # Show raw response
                             message_placeholder.markdown(chunk_buffer + " ▌")
-                    # nosemgrep arbitrary-sleep
-                    time.sleep(0.01)  # Reduced delay since we're batching updates
 
                 # Final response without cursor
+                chunk_buffer = "".join(chunks)
                 if auto_format:
                     full_response = clean_response_text(chunk_buffer, show_thinking)
                 else:
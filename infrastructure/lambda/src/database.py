@@ -2,6 +2,7 @@
 # and have removed the following commercial license tools 'kegg', 'iucn', and 'remap'. 
 # It invokes Amazon Bedrock LLMs directly with the converse API. Note, this script depends upon you setting up 
 # the schema folder under 'schema_db'
+import functools
 import json
 import sys
 import os
@@ -23,8 +24,9 @@ except ImportError as e:
     BEDROCK_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=1)
 def get_bedrock_client():
-    """Get Bedrock runtime client for database queries."""
+    """Get Bedrock runtime client for database queries, reused across warm invocations."""
     if not BEDROCK_AVAILABLE:
         return None
 
@@ -1,12 +1,42 @@
 import asyncio
+import logging
+import os
 
+import boto3
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from botocore.config import Config
 from search_pmc import search_pmc_tool
 from strands import Agent
 from strands.models import BedrockModel
+from strands.tools.executors import ConcurrentToolExecutor
+from strands.types.content import SystemContentBlock
 
 MODEL_ID = "global.anthropic.claude-sonnet-4-6"
 
+# Configure logging
+logging.basicConfig(
+    format="%(levelname)s | %(name)s | %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("agent")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+# Set BEDROCK_LATENCY=optimized to use latency-optimized inference on supported models
+BEDROCK_LATENCY = os.getenv("BEDROCK_LATENCY", "standard")
+
+# Coalesce streamed text into fewer, larger chunks
+STREAM_FLUSH_CHUNKS = 32
+STREAM_FLUSH_SECONDS = 0.02
+
+# Shared boto3 session and tuned client config for the Bedrock runtime client
+BOTO_SESSION = boto3.Session()
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+    read_timeout=120,
+)
+
 SYSTEM_PROMPT = """You are a life science research assistant. When given a scientific question, follow this process:
 
 1. Use search_pmc_tool with max_search_result_count between 200 and 500 and max_filtered_result_count between 10 and 20 to find highly-cited papers. Search broadly first, then narrow down. Use temporal filters like "last 5 years"[dp] for recent work. 
@@ -15,15 +45,34 @@ SYSTEM_PROMPT = """You are a life science research assistant. When given a scien
 4. Return URL links associated with PMCID references
 """
 
+# Use uvloop for the runtime event loop when it is installed
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 app = BedrockAgentCoreApp()
 
+# Define system content with cache points
+system_content = [
+    SystemContentBlock(text=SYSTEM_PROMPT),
+    SystemContentBlock(cachePoint={"type": "default"}),
+]
+
 model = BedrockModel(
     model_id=MODEL_ID,
+    boto_session=BOTO_SESSION,
+    boto_client_config=BOTO_CONFIG,
+    cache_tools="default",
+    additional_args={"performanceConfig": {"latency": BEDROCK_LATENCY}},
 )
 agent = Agent(
     model=model,
     tools=[search_pmc_tool],
-    system_prompt=SYSTEM_PROMPT,
+    system_prompt=system_content,
+    tool_executor=ConcurrentToolExecutor(),
 )
 
 
@@ -33,23 +82,43 @@ async def strands_agent_bedrock(payload):
     Invoke the agent with a payload
     """
     user_input = payload.get("prompt")
-    print("User input:", user_input)
+    logger.info(f"User input: {user_input}")
+    loop = asyncio.get_running_loop()
+    buffer = []
+    last_flush = loop.time()
     try:
         async for event in agent.stream_async(user_input):
 
+            # Buffer event data; most events are text deltas, so check them first
+            if (data := event.get("data")) is not None:
+                buffer.append(data)
+
             # Print tool use
-            for content in event.get("message", {}).get("content", []):
-                if tool_use := content.get("toolUse"):
-                    yield "\n"
-                    yield f"🔧 Using tool: {tool_use['name']}"
-                    for k, v in tool_use["input"].items():
-                        yield f"**{k}**: {v}\n"
-                    yield "\n"
-
-            # Print event data
-            if "data" in event:
-                yield event["data"]
+            elif message := event.get("message"):
+                for content in message.get("content", ()):
+                    if tool_use := content.get("toolUse"):
+                        if buffer:
+                            yield "".join(buffer)
+                            buffer.clear()
+                        # Send the tool banner as a single frame
+                        args = "".join(
+                            f"**{k}**: {v}\n" for k, v in tool_use["input"].items()
+                        )
+                        yield f"\n🔧 Using tool: {tool_use['name']}\n{args}\n"
+
+            # Flush buffered data in batches
+            if buffer and (
+                len(buffer) >= STREAM_FLUSH_CHUNKS
+                or loop.time() - last_flush > STREAM_FLUSH_SECONDS
+            ):
+                yield "".join(buffer)
+                buffer.clear()
+                last_flush = loop.time()
+        if buffer:
+            yield "".join(buffer)
     except Exception as e:
+        if buffer:
+            yield "".join(buffer)
         yield f"Error: {str(e)}"
 
 
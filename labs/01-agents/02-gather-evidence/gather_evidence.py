@@ -1,12 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 # SPDX-License-Identifier: MIT-0
+import copy
+import functools
 import logging
 import os
-import re
+import threading
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
 
 import boto3
+from botocore import UNSIGNED
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from paperqa import Settings, ask
 from paperqa.settings import (AgentSettings, AnswerSettings, IndexSettings,
@@ -16,7 +22,11 @@ import warnings
 warnings.filterwarnings("ignore", module="litellm")
 
 # Global configuration for commercial use filtering
-COMMERCIAL_USE_ONLY = os.getenv("COMMERCIAL_USE_ONLY", True)
+COMMERCIAL_USE_ONLY = os.getenv("COMMERCIAL_USE_ONLY", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
 
 # Paper-QA Model Configuration
 PAPERQA_LLM = os.getenv("PAPERQA_LLM", "global.anthropic.claude-sonnet-4-6")
@@ -30,9 +40,31 @@ PAPERQA_EMBEDDING = os.getenv(
     "PAPERQA_EMBEDDING", "bedrock/amazon.titan-embed-text-v2:0"
 )
 PAPERQA_AGENT_TYPE = os.getenv("PAPERQA_AGENT_TYPE", "fake")
-PAPERQA_EVIDENCE_K = os.getenv("EVIDENCE_K", 5)
+PAPERQA_EVIDENCE_K = int(os.getenv("EVIDENCE_K", "5"))
 PAPERQA_EVIDENCE_SUMMARY_LENGTH = os.getenv("EVIDENCE_SUMMARY_LENGTH", "25 to 50 words")
 
+# Successful answers reused for repeat (PMCID, question, source) lookups
+ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", "128"))
+_ANSWER_CACHE: "OrderedDict[Tuple[str, str, Optional[str]], dict]" = OrderedDict()
+_ANSWER_CACHE_LOCK = threading.Lock()
+
+# PMC Open Access subsets; the subset a local copy came from is recorded
+# next to it so cached copies still respect COMMERCIAL_USE_ONLY
+COMMERCIAL_SUBSET = "oa_comm"
+NONCOMMERCIAL_SUBSET = "oa_noncomm"
+
+# Anonymous S3 client for the PMC Open Access bucket, shared across calls
+S3_CLIENT = boto3.client(
+    "s3",
+    region_name="us-east-1",
+    config=Config(
+        signature_version=UNSIGNED,
+        max_pool_connections=32,
+        retries={"max_attempts": 3, "mode": "adaptive"},
+        tcp_keepalive=True,
+    ),
+)
+
 # Configure logging
 logging.basicConfig(
     format="%(levelname)s | %(name)s | %(message)s",
@@ -72,6 +104,10 @@ def _configure_paperqa_logging():
         pqa_logger.propagate = False
 
 
+# Configure PaperQA logging once to avoid Rich handler errors in Jupyter
+_configure_paperqa_logging()
+
+
 class PMCError(Exception):
     """Base exception for PMC-related errors"""
 
@@ -100,29 +136,17 @@ def _validate_pmcid(pmcid: str) -> bool:
     Returns:
         bool: True if valid format, False otherwise
     """
-    logger.debug(f"Validating PMCID: {pmcid} (type: {type(pmcid)})")
-
-    if not isinstance(pmcid, str):
-        logger.debug(f"PMCID validation failed: not a string (type: {type(pmcid)})")
-        return False
-
-    if not pmcid:
-        logger.debug("PMCID validation failed: empty string")
-        return False
-
-    if not pmcid.startswith("PMC"):
-        logger.debug(f"PMCID validation failed: does not start with 'PMC' - {pmcid}")
-        return False
-
-    pattern_match = bool(re.match(r"^PMC\d+$", pmcid))
-    if not pattern_match:
-        logger.debug(
-            f"PMCID validation failed: does not match pattern PMC\\d+ - {pmcid}"
-        )
-    else:
-        logger.debug(f"PMCID validation successful: {pmcid}")
+    # Prefix and digit checks run in C and avoid the regex engine
+    is_valid = (
+        isinstance(pmcid, str)
+        and pmcid.startswith("PMC")
+        and pmcid[3:].isascii()
+        and pmcid[3:].isdigit()
+    )
+    if not is_valid and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"PMCID validation failed: {pmcid!r} does not match PMC\\d+")
 
-    return pattern_match
+    return is_valid
 
 
 def _download_from_s3(bucket: str, key: str, local_folder: str = "my_papers") -> str:
@@ -143,18 +167,6 @@ def _download_from_s3(bucket: str, key: str, local_folder: str = "my_papers") ->
     s3_path = f"s3://{bucket}/{key}"
 
     try:
-        # Configure S3 client for anonymous access
-        from botocore import UNSIGNED
-        from botocore.config import Config
-
-        logger.debug(f"Configuring S3 client for anonymous access to {s3_path}")
-
-        s3_client = boto3.client(
-            "s3",
-            region_name="us-east-1",
-            config=Config(signature_version=UNSIGNED),
-        )
-
         # Create local folder if it doesn't exist
         os.makedirs(local_folder, exist_ok=True)
         logger.debug(f"Ensured local folder exists: {local_folder}")
@@ -166,7 +178,7 @@ def _download_from_s3(bucket: str, key: str, local_folder: str = "my_papers") ->
         logger.info(f"Attempting to download {s3_path} to {local_path}")
 
         # Download the file
-        s3_client.download_file(bucket, key, local_path)
+        S3_CLIENT.download_file(bucket, key, local_path)
 
         logger.info(f"Successfully downloaded file to {local_path}")
         return local_path
@@ -222,6 +234,189 @@ def _download_from_s3(bucket: str, key: str, local_folder: str = "my_papers") ->
         raise PMCS3Error(f"Failed to download from S3: {str(e)}")
 
 
+@functools.lru_cache(maxsize=64)
+def _build_settings(paper_directory: str, index_directory: str) -> Settings:
+    """
+    Build paper-qa settings for an article's folders, cached per article
+
+    Args:
+        paper_directory: Folder containing the downloaded article text
+        index_directory: Folder for the article's paper-qa index
+
+    Returns:
+        Settings: paper-qa settings using the module-level model configuration
+    """
+    return Settings(
+        llm=PAPERQA_LLM,
+        summary_llm=PAPERQA_SUMMARY_LLM,
+        agent=AgentSettings(
+            agent_llm=PAPERQA_AGENT_LLM,
+            index=IndexSettings(
+                index_directory=index_directory,
+                paper_directory=paper_directory,
+            ),
+            agent_type=PAPERQA_AGENT_TYPE,
+        ),
+        embedding=PAPERQA_EMBEDDING,
+        parsing=ParsingSettings(use_doc_details=False),
+        answer=AnswerSettings(
+            answer_max_sources=1,
+            evidence_k=PAPERQA_EVIDENCE_K,
+            evidence_summary_length=PAPERQA_EVIDENCE_SUMMARY_LENGTH,
+        ),
+    )
+
+
+def _object_exists(bucket: str, key: str) -> bool:
+    """
+    Check whether an object exists in S3 with a HeadObject request
+
+    Args:
+        bucket: S3 bucket name
+        key: S3 object key
+
+    Returns:
+        bool: True if the object exists, False if it is not found
+
+    Raises:
+        PMCS3Error: If the check fails for any other reason
+    """
+    try:
+        S3_CLIENT.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as e:
+        error_code = e.response.get("Error", {}).get("Code", "Unknown")
+        if error_code in ("404", "NoSuchKey", "NotFound"):
+            return False
+        logger.warning(f"S3 error checking s3://{bucket}/{key}: {error_code}")
+        raise PMCS3Error(f"S3 access error ({error_code}) for s3://{bucket}/{key}")
+
+
+def _fetch_article(
+    pmcid: str,
+    bucket: str,
+    commercial_key: str,
+    noncommercial_key: str,
+    local_folder: str,
+) -> Optional[Tuple[str, str]]:
+    """
+    Download a PMC article, preferring the commercial use subset
+
+    Args:
+        pmcid: PMC identifier (e.g., "PMC6033041")
+        bucket: S3 bucket name
+        commercial_key: S3 object key in the commercial use subset
+        noncommercial_key: S3 object key in the non-commercial use subset
+        local_folder: Local folder to save the file
+
+    Returns:
+        Optional[Tuple[str, str]]: Path to the downloaded file and the subset it
+        came from, or None if the article is not in the PMC Open Access Subset
+
+    Raises:
+        PMCS3Error: If download fails for any other reason
+    """
+    if COMMERCIAL_USE_ONLY:
+        try:
+            logger.debug(f"Checking commercial bucket for {pmcid}")
+            local_file_path = _download_from_s3(
+                bucket, commercial_key, local_folder=local_folder
+            )
+            logger.info(f"Successfully retrieved commercial article {pmcid}")
+            return local_file_path, COMMERCIAL_SUBSET
+
+        except PMCS3Error as e:
+            if "not found" not in str(e).lower():
+                logger.warning(f"S3 error accessing commercial bucket: {str(e)}")
+                raise e
+            logger.warning(
+                f"Article {pmcid} not found in commercial bucket and COMMERCIAL_USE_ONLY is set to True"
+            )
+            raise PMCS3Error(
+                f"Article {pmcid} not found in commercial bucket and COMMERCIAL_USE_ONLY is set to True"
+            )
+
+    # Probe both subsets at once with cheap HeadObject requests, then download
+    # only the preferred copy
+    logger.debug(f"Checking commercial and non-commercial buckets for {pmcid}")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        in_commercial, in_noncommercial = executor.map(
+            lambda key: _object_exists(bucket, key), (commercial_key, noncommercial_key)
+        )
+
+    if in_commercial:
+        local_file_path = _download_from_s3(
+            bucket, commercial_key, local_folder=local_folder
+        )
+        logger.info(f"Successfully retrieved commercial article {pmcid}")
+        return local_file_path, COMMERCIAL_SUBSET
+    if in_noncommercial:
+        local_file_path = _download_from_s3(
+            bucket, noncommercial_key, local_folder=local_folder
+        )
+        logger.warning(
+            f"Article {pmcid} found in non-commercial bucket - licensing restrictions may apply"
+        )
+        return local_file_path, NONCOMMERCIAL_SUBSET
+    return None
+
+
+def _cached_article_path(local_file_path: str, subset_path: str) -> Optional[str]:
+    """
+    Return a previously downloaded article if its subset is currently allowed
+
+    Args:
+        local_file_path: Path of the downloaded article text
+        subset_path: Path of the file recording which subset the article came from
+
+    Returns:
+        Optional[str]: The local article path, or None if it must be downloaded
+    """
+    try:
+        with open(subset_path, encoding="utf-8") as f:
+            subset = f.read().strip()
+    except OSError:
+        return None
+
+    allowed = subset == COMMERCIAL_SUBSET or (
+        subset == NONCOMMERCIAL_SUBSET and not COMMERCIAL_USE_ONLY
+    )
+    if allowed and os.path.isfile(local_file_path) and os.path.getsize(local_file_path) > 0:
+        return local_file_path
+    return None
+
+
+def _error_response(
+    error_msg: str, question: str, pmcid: str, source: Optional[str]
+) -> dict:
+    """
+    Build an error ToolResult for gather_evidence
+
+    Args:
+        error_msg: Error message to return to the agent
+        question: The question that was asked
+        pmcid: PMC identifier of the article
+        source: Optional DOI URL for citation purposes
+
+    Returns:
+        dict: ToolResult with error status
+    """
+    return {
+        "status": "error",
+        "content": [
+            {"text": error_msg},
+            {
+                "json": {
+                    "question": question,
+                    "pmcid": pmcid,
+                    "source": source
+                    or f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/",
+                }
+            },
+        ],
+    }
+
+
 def gather_evidence(pmcid: str, question: str, source: Optional[str] = None) -> dict:
     """
     Answer questions about a PMC article using paper-qa for intelligent retrieval.
@@ -239,28 +434,24 @@ def gather_evidence(pmcid: str, question: str, source: Optional[str] = None) ->
     """
     logger.info(f"Starting gather_evidence for PMCID: {pmcid}, question: {question}")
 
-    # Configure PaperQA logging to avoid Rich handler errors in Jupyter
-    _configure_paperqa_logging()
-
     try:
         # Step 1: Validate PMCID format
         if not _validate_pmcid(pmcid):
             error_msg = f"Invalid PMCID format: {pmcid}. Expected format: PMC followed by numbers (e.g., PMC6033041)"
             logger.warning(error_msg)
-            return {
-                "status": "error",
-                "content": [
-                    {"text": error_msg},
-                    {
-                        "json": {
-                            "question": question,
-                            "pmcid": pmcid,
-                            "source": source
-                            or f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/",
-                        }
-                    },
-                ],
-            }
+            return _error_response(error_msg, question, pmcid, source)
+
+        # Return a cached answer if this question was already asked of the paper
+        cache_key = (pmcid, " ".join(question.lower().split()), source)
+        with _ANSWER_CACHE_LOCK:
+            cached = _ANSWER_CACHE.get(cache_key)
+            if cached is not None:
+                _ANSWER_CACHE.move_to_end(cache_key)
+        if cached is not None:
+            logger.info(f"Returning cached answer for {pmcid}")
+            # Strands sets toolUseId on the returned dict, so never hand out the
+            # cached object itself
+            return copy.deepcopy(cached)
 
         # S3 configuration
         bucket = "pmc-oa-opendata"
@@ -269,59 +460,25 @@ def gather_evidence(pmcid: str, question: str, source: Optional[str] = None) ->
         local_text_folder = f"my_papers/{pmcid}/txt"
         local_index_folder = f"my_papers/{pmcid}/index"
 
-        # Step 2: Try to download from commercial bucket first
-        local_file_path = None
-        try:
-            logger.debug(f"Checking commercial bucket for {pmcid}")
-            local_file_path = _download_from_s3(
-                bucket, commercial_key, local_folder=local_text_folder
+        # Step 2: Reuse a previously downloaded copy, otherwise try to download
+        # from commercial bucket first
+        subset_path = f"my_papers/{pmcid}/subset"
+        local_file_path = _cached_article_path(
+            os.path.join(local_text_folder, f"{pmcid}.txt"), subset_path
+        )
+        if local_file_path:
+            logger.info(f"Using cached article {pmcid} at {local_file_path}")
+        else:
+            fetched = _fetch_article(
+                pmcid, bucket, commercial_key, noncommercial_key, local_text_folder
             )
-            logger.info(f"Successfully retrieved commercial article {pmcid}")
-
-        except PMCS3Error as e:
-            if "not found" not in str(e).lower():
-                logger.warning(f"S3 error accessing commercial bucket: {str(e)}")
-                raise e
-
-            # Try non-commercial bucket
-            logger.debug(f"Article {pmcid} not found in commercial bucket")
-            if COMMERCIAL_USE_ONLY:
-                logger.warning(
-                    f"Article {pmcid} not found in commercial bucket and COMMERCIAL_USE_ONLY is set to True"
-                )
-                raise PMCS3Error(
-                    f"Article {pmcid} not found in commercial bucket and COMMERCIAL_USE_ONLY is set to True"
-                )
-            logger.info(f"Checking non-commercial bucket for {pmcid}")
-
-            try:
-                local_file_path = _download_from_s3(
-                    bucket, noncommercial_key, local_folder=local_text_folder
-                )
-                logger.warning(
-                    f"Article {pmcid} found in non-commercial bucket - licensing restrictions may apply"
-                )
-
-            except PMCS3Error as nc_error:
-                if "not found" in str(nc_error).lower():
-                    error_msg = f"Article {pmcid} is not available in the PMC Open Access Subset on AWS"
-                    logger.info(error_msg)
-                    return {
-                        "status": "error",
-                        "content": [
-                            {"text": error_msg},
-                            {
-                                "json": {
-                                    "question": question,
-                                    "pmcid": pmcid,
-                                    "source": source
-                                    or f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/",
-                                }
-                            },
-                        ],
-                    }
-                else:
-                    raise nc_error
+            if fetched is None:
+                error_msg = f"Article {pmcid} is not available in the PMC Open Access Subset on AWS"
+                logger.info(error_msg)
+                return _error_response(error_msg, question, pmcid, source)
+            local_file_path, subset = fetched
+            with open(subset_path, "w", encoding="utf-8") as f:
+                f.write(subset)
 
         # Step 3: Use paper-qa to answer the question
         logger.info(f"Processing paper with paper-qa for question: {question}")
@@ -330,35 +487,18 @@ def gather_evidence(pmcid: str, question: str, source: Optional[str] = None) ->
         logger.debug(f"Using paper directory: {local_text_folder}")
 
         # Configure paper-qa settings
-        settings = Settings(
-            llm=PAPERQA_LLM,
-            summary_llm=PAPERQA_SUMMARY_LLM,
-            agent=AgentSettings(
-                agent_llm=PAPERQA_AGENT_LLM,
-                index=IndexSettings(
-                    index_directory=local_index_folder,
-                    paper_directory=local_text_folder,
-                ),
-                agent_type=PAPERQA_AGENT_TYPE,
-            ),
-            embedding=PAPERQA_EMBEDDING,
-            parsing=ParsingSettings(use_doc_details=False),
-            answer=AnswerSettings(
-                answer_max_sources=1,
-                evidence_k=PAPERQA_EVIDENCE_K,
-                evidence_summary_length=PAPERQA_EVIDENCE_SUMMARY_LENGTH,
-            ),
-        )
+        settings = _build_settings(local_text_folder, local_index_folder)
 
         # Ask the question
         logger.info("Invoking paper-qa")
         answer = ask(question, settings=settings)
 
         # Format the response using Strands ToolResult format
-        answer_text = answer.session.answer
+        session = answer.session
+        answer_text = session.answer
         contexts = [
             {"chunk": context.text.name, "summary": context.context}
-            for context in answer.session.contexts
+            for context in session.contexts
         ]
         # Grab first citation entry
         # citation = answer.session.contexts[0].text.doc.formatted_citation
@@ -369,14 +509,14 @@ def gather_evidence(pmcid: str, question: str, source: Optional[str] = None) ->
         logger.info(f"Successfully answered question for {pmcid}")
         logger.debug(f"Answer: {answer_text[:200]}...")
 
-        return {
+        result = {
             "status": "success",
             "content": [
                 {"text": answer_text},
                 {
                     "json": {
                         "evidence_id": evidence_id,
-                        "question": answer.session.question,
+                        "question": session.question,
                         "context": contexts,
                         "source": source
                         or f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/",
@@ -384,61 +524,27 @@ def gather_evidence(pmcid: str, question: str, source: Optional[str] = None) ->
                 },
             ],
         }
+        with _ANSWER_CACHE_LOCK:
+            _ANSWER_CACHE[cache_key] = copy.deepcopy(result)
+            if len(_ANSWER_CACHE) > ANSWER_CACHE_SIZE:
+                _ANSWER_CACHE.popitem(last=False)
+        return result
 
     except PMCValidationError as e:
         logger.warning(f"PMCID validation error: {str(e)}")
-        return {
-            "status": "error",
-            "content": [
-                {"text": str(e)},
-                {
-                    "json": {
-                        "question": question,
-                        "pmcid": pmcid,
-                        "source": source
-                        or f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/",
-                    }
-                },
-            ],
-        }
+        return _error_response(str(e), question, pmcid, source)
 
     except PMCS3Error as e:
         logger.error(f"S3 error: {str(e)}")
         error_msg = f"Error accessing PMC Open Access Subset for {pmcid}: {str(e)}"
-        return {
-            "status": "error",
-            "content": [
-                {"text": error_msg},
-                {
-                    "json": {
-                        "question": question,
-                        "pmcid": pmcid,
-                        "source": source
-                        or f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/",
-                    }
-                },
-            ],
-        }
+        return _error_response(error_msg, question, pmcid, source)
 
     except Exception as e:
         logger.error(
             f"Unexpected error in gather_evidence_tool: {str(e)}", exc_info=True
         )
         error_msg = f"An unexpected error occurred while processing {pmcid}: {str(e)}"
-        return {
-            "status": "error",
-            "content": [
-                {"text": error_msg},
-                {
-                    "json": {
-                        "question": question,
-                        "pmcid": pmcid,
-                        "source": source
-                        or f"https://www.ncbi.nlm.nih.gov/pmc/articles/{pmcid}/",
-                    }
-                },
-            ],
-        }
+        return _error_response(error_msg, question, pmcid, source)
 
 
 @tool
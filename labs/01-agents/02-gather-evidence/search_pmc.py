@@ -15,7 +15,11 @@ from defusedxml import ElementTree as ET
 from strands import tool
 
 # Global configuration for commercial use filtering
-COMMERCIAL_USE_ONLY = os.getenv("COMMERCIAL_USE_ONLY", True)
+COMMERCIAL_USE_ONLY = os.getenv("COMMERCIAL_USE_ONLY", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
 
 # Configure logging
 logging.basicConfig(
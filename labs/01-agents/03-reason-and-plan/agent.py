@@ -1,10 +1,14 @@
 import asyncio
+import logging
 
+import boto3
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from botocore.config import Config
 from search_pmc import search_pmc_tool
 from gather_evidence import gather_evidence_tool
 from strands import Agent
 from strands.models import BedrockModel
+from strands.tools.executors import ConcurrentToolExecutor
 from strands.types.content import SystemContentBlock
 
 from strands_tools import editor
@@ -12,6 +16,38 @@ import os
 
 from config import MODEL_ID, SYSTEM_PROMPT
 
+# Configure logging
+logging.basicConfig(
+    format="%(levelname)s | %(name)s | %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("agent")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+# Set BEDROCK_LATENCY=optimized to use latency-optimized inference on supported models
+BEDROCK_LATENCY = os.getenv("BEDROCK_LATENCY", "standard")
+
+# Coalesce streamed text into fewer, larger chunks
+STREAM_FLUSH_CHUNKS = 32
+STREAM_FLUSH_SECONDS = 0.02
+
+# Shared boto3 session and tuned client config for the Bedrock runtime client
+BOTO_SESSION = boto3.Session()
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+    read_timeout=120,
+)
+
+# Use uvloop for the runtime event loop when it is installed
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 app = BedrockAgentCoreApp()
 
 # Define system content with cache points
@@ -22,6 +58,8 @@ system_content = [
 
 model = BedrockModel(
     model_id=MODEL_ID,
+    boto_session=BOTO_SESSION,
+    boto_client_config=BOTO_CONFIG,
     max_tokens=10000,
     cache_tools="default",
     temperature=1,
@@ -32,6 +70,7 @@ model = BedrockModel(
             "budget_tokens": 3000,
         },
     },
+    additional_args={"performanceConfig": {"latency": BEDROCK_LATENCY}},
 )
 
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
@@ -40,6 +79,7 @@ agent = Agent(
     model=model,
     tools=[editor, search_pmc_tool, gather_evidence_tool],
     system_prompt=system_content,
+    tool_executor=ConcurrentToolExecutor(),
 )
 
 
@@ -49,23 +89,43 @@ async def strands_agent_bedrock(payload):
     Invoke the agent with a payload
     """
     user_input = payload.get("prompt")
-    print("User input:", user_input)
+    logger.info(f"User input: {user_input}")
+    loop = asyncio.get_running_loop()
+    buffer = []
+    last_flush = loop.time()
     try:
         async for event in agent.stream_async(user_input):
 
+            # Buffer event data; most events are text deltas, so check them first
+            if (data := event.get("data")) is not None:
+                buffer.append(data)
+
             # Print tool use
-            for content in event.get("message", {}).get("content", []):
-                if tool_use := content.get("toolUse"):
-                    yield "\n"
-                    yield f"🔧 Using tool: {tool_use['name']}"
-                    for k, v in tool_use["input"].items():
-                        yield f"**{k}**: {v}\n"
-                    yield "\n"
-
-            # Print event data
-            if "data" in event:
-                yield event["data"]
+            elif message := event.get("message"):
+                for content in message.get("content", ()):
+                    if tool_use := content.get("toolUse"):
+                        if buffer:
+                            yield "".join(buffer)
+                            buffer.clear()
+                        # Send the tool banner as a single frame
+                        args = "".join(
+                            f"**{k}**: {v}\n" for k, v in tool_use["input"].items()
+                        )
+                        yield f"\n🔧 Using tool: {tool_use['name']}\n{args}\n"
+
+            # Flush buffered data in batches
+            if buffer and (
+                len(buffer) >= STREAM_FLUSH_CHUNKS
+                or loop.time() - last_flush > STREAM_FLUSH_SECONDS
+            ):
+                yield "".join(buffer)
+                buffer.clear()
+                last_flush = loop.time()
+        if buffer:
+            yield "".join(buffer)
     except Exception as e:
+        if buffer:
+            yield "".join(buffer)
         yield f"Error: {str(e)}"
 
 
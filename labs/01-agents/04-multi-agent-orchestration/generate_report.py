@@ -1,14 +1,31 @@
-import json
 import logging
 import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import date
 
 import boto3
 import botocore
 from strands import tool
 
+# Use orjson for encoding requests and decoding responses when it is installed
+try:
+    from orjson import dumps as json_dumps
+    from orjson import loads as json_loads
+except ImportError:
+    from json import dumps as json_dumps
+    from json import loads as json_loads
+
 # Dynamo DB Configuration
 EVIDENCE_TABLE_NAME = os.getenv("EVIDENCE_TABLE_NAME", "deep-research-evidence")
+BATCH_GET_MAX_KEYS = 100
+BATCH_GET_MAX_RETRIES = 5
+
+# Evidence records are written once, so reads are cached for the process lifetime
+EVIDENCE_CACHE_SIZE = int(os.getenv("EVIDENCE_CACHE_SIZE", "1024"))
+_EVIDENCE_CACHE: "OrderedDict[str, dict]" = OrderedDict()
+_EVIDENCE_CACHE_LOCK = threading.Lock()
 
 # Configure logging
 logging.basicConfig(
@@ -76,16 +93,67 @@ Quality Standards:
 - End with actionable insights or clear implications based on your research findings
 """
 
+# System prompt block with a cache point, built once and reused for every request
+SYSTEM_CONTENT = [
+    {
+        "type": "text",
+        "text": SYSTEM_PROMPT,
+        "cache_control": {"type": "ephemeral"},
+    }
+]
 
-def _get_evidence_record(evidence_id: str) -> dict:
-    """Get an evidence record from DynamobDB table by evidence_id value"""
-
-    # Check if table exists
-    table = dynamodb.Table(EVIDENCE_TABLE_NAME)
 
-    response = table.get_item(Key={"evidence_id": evidence_id})
+def _batch_get_evidence_records(evidence_ids: list) -> list:
+    """Get evidence records from DynamoDB table by evidence_id values, in request order"""
 
-    return response.get("Item")
+    # Serve cached records first
+    items = {}
+    with _EVIDENCE_CACHE_LOCK:
+        for evidence_id in evidence_ids:
+            if (item := _EVIDENCE_CACHE.get(evidence_id)) is not None:
+                _EVIDENCE_CACHE.move_to_end(evidence_id)
+                items[evidence_id] = item
+
+    # BatchGetItem rejects duplicate keys, so de-duplicate while keeping order
+    unique_ids = [
+        evidence_id
+        for evidence_id in dict.fromkeys(evidence_ids)
+        if evidence_id not in items
+    ]
+    fetched = {}
+
+    for start in range(0, len(unique_ids), BATCH_GET_MAX_KEYS):
+        request_items = {
+            EVIDENCE_TABLE_NAME: {
+                "Keys": [
+                    {"evidence_id": evidence_id}
+                    for evidence_id in unique_ids[start : start + BATCH_GET_MAX_KEYS]
+                ]
+            }
+        }
+        attempt = 0
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            for item in response.get("Responses", {}).get(EVIDENCE_TABLE_NAME, []):
+                fetched[item["evidence_id"]] = item
+
+            # Retry any keys DynamoDB could not process with exponential backoff
+            request_items = response.get("UnprocessedKeys")
+            if request_items:
+                if attempt >= BATCH_GET_MAX_RETRIES:
+                    logger.warning("Giving up on unprocessed evidence records")
+                    break
+                time.sleep(0.05 * 2**attempt)
+                attempt += 1
+
+    if fetched:
+        with _EVIDENCE_CACHE_LOCK:
+            _EVIDENCE_CACHE.update(fetched)
+            while len(_EVIDENCE_CACHE) > EVIDENCE_CACHE_SIZE:
+                _EVIDENCE_CACHE.popitem(last=False)
+        items.update(fetched)
+
+    return [items[evidence_id] for evidence_id in evidence_ids if evidence_id in items]
 
 
 def parse_db_records(records):
@@ -110,24 +178,31 @@ def parse_db_records(records):
             },
         )
 
+    # Cache the system prompt and evidence prefix across repeated report requests
+    if contents:
+        contents[-1]["cache_control"] = {"type": "ephemeral"}
+
     return contents
 
 
-def format_inline_citations(response_content: dict) -> None:
+def format_inline_citations(response_content: dict) -> str:
     """Format response from Anthropic Claude citations API into inline citations"""
-    output = ""
+    parts = []
     for content_item in response_content.get("content"):
-        output += content_item.get("text")
+        text = content_item.get("text")
+        if text:
+            parts.append(text)
         for citation in content_item.get("citations", []):
             title = citation.get("document_title")
-            # If last character is punctuation, remove it
-            if output[-1] in [".", ",", "?", "!"]:
-                punctuation = output[-1]
-                output = output[:-1] + f" ({title}){punctuation}"
+            # If last character is punctuation, move it after the citation
+            last = parts[-1] if parts else ""
+            if last and last[-1] in ".,?!":
+                parts[-1] = last[:-1]
+                parts.append(f" ({title}){last[-1]}")
             else:
-                output += f" ({title})"
+                parts.append(f" ({title})")
 
-    return output
+    return "".join(parts)
 
 
 def generate_report(prompt: str, evidence_ids: list = []) -> str:
@@ -137,9 +212,7 @@ def generate_report(prompt: str, evidence_ids: list = []) -> str:
 
     if evidence_ids:
         logger.info("Getting evidence records")
-        evidence = []
-        for evidence_id in evidence_ids:
-            evidence.append(_get_evidence_record(evidence_id))
+        evidence = _batch_get_evidence_records(evidence_ids)
         logger.info("Parsing evidence records")
         content = parse_db_records(evidence)
 
@@ -150,7 +223,7 @@ def generate_report(prompt: str, evidence_ids: list = []) -> str:
         "anthropic_version": "bedrock-2023-05-31",
         "messages": [{"role": "user", "content": content}],
         "max_tokens": 10000,
-        "system": SYSTEM_PROMPT,
+        "system": SYSTEM_CONTENT,
     }
 
     logger.info("Invoking Anthropic Claude citations API")
@@ -158,12 +231,12 @@ def generate_report(prompt: str, evidence_ids: list = []) -> str:
         modelId="us.anthropic.claude-sonnet-4-20250514-v1:0",
         contentType="application/json",
         accept="application/json",
-        body=json.dumps(request_body),
+        body=json_dumps(request_body),
     )
 
     logger.info("Formatting report with inline citations")
 
-    formatted_result = format_inline_citations(json.loads(response["body"].read()))
+    formatted_result = format_inline_citations(json_loads(response["body"].read()))
     return formatted_result
 
 
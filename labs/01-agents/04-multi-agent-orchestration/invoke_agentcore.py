@@ -5,13 +5,92 @@ This module provides a simplified interface for testing agents deployed to
 Amazon Bedrock AgentCore from within Jupyter notebooks.
 """
 
+import asyncio
+import functools
 import json
+import sys
+import threading
+import time
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import boto3
 import botocore
 
+# Use orjson for encoding payloads and decoding streamed events when it is installed
+try:
+    from orjson import dumps as json_dumps_bytes
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Agent ARNs keyed by (region, agent runtime name), reused for a few minutes
+ARN_CACHE_TTL_SECONDS = 300
+_ARN_CACHE: Dict[Tuple[Optional[str], str], Tuple[float, str]] = {}
+
+# One session and client config per service, shared by every notebook call;
+# boto3 sessions are not thread-safe, so clients are created under a lock
+_SESSION = boto3.Session()
+_CLIENT_LOCK = threading.Lock()
+CONTROL_CLIENT_CONFIG = botocore.config.Config(
+    tcp_keepalive=True, retries={"max_attempts": 5, "mode": "adaptive"}
+)
+RUNTIME_CLIENT_CONFIG = botocore.config.Config(
+    read_timeout=900, connect_timeout=5, tcp_keepalive=True
+)
+
+# Streamed chunks written to stdout between flushes
+STREAM_FLUSH_CHUNKS = 16
+
+# Runtime sessions reused by calls that don't pass a session_id, one per
+# (region, agent runtime name) so different agents never share history
+_DEFAULT_SESSION_IDS: Dict[Tuple[Optional[str], str], str] = {}
+
+
+def reset_session() -> None:
+    """Start new default runtime sessions on the next invoke_agentcore() calls."""
+    _DEFAULT_SESSION_IDS.clear()
+
+
+@functools.lru_cache(maxsize=16)
+def _get_client(
+    service_name: str, region_name: Optional[str], config: botocore.config.Config
+) -> Any:
+    """Return a cached boto3 client so repeat calls reuse its connection pool."""
+    with _CLIENT_LOCK:
+        return _SESSION.client(service_name, region_name=region_name, config=config)
+
+
+def _lookup_agent_arn(
+    control_client: Any, agent_runtime_name: str, region_name: Optional[str]
+) -> Optional[str]:
+    """Return the ARN for an agent runtime name, using the TTL cache when possible."""
+    cached = _ARN_CACHE.get((region_name, agent_runtime_name))
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    # Cache every runtime on each page so lookups by other names also hit,
+    # and stop paging once the requested agent has been found
+    pages = control_client.get_paginator("list_agent_runtimes").paginate(
+        PaginationConfig={"PageSize": 100}
+    )
+    expires_at = time.monotonic() + ARN_CACHE_TTL_SECONDS
+    agent_arn = None
+    for page in pages:
+        for agent in page.get("agentRuntimes", []):
+            name = agent.get("agentRuntimeName")
+            arn = agent.get("agentRuntimeArn")
+            _ARN_CACHE[(region_name, name)] = (expires_at, arn)
+            if name == agent_runtime_name:
+                agent_arn = arn
+        if agent_arn:
+            break
+
+    return agent_arn
+
 
 def invoke_agentcore(
     agent_runtime_name: str,
@@ -25,7 +104,7 @@ def invoke_agentcore(
     Args:
         agent_runtime_name: Name of the deployed agent runtime
         prompt: The prompt/question to send to the agent
-        session_id: Optional session ID for conversation continuity (auto-generated if not provided)
+        session_id: Optional session ID for conversation continuity (reuses a default session if not provided)
         region_name: Optional AWS region name (uses default if not provided)
 
     Example:
@@ -35,22 +114,14 @@ def invoke_agentcore(
         ... )
     """
     # Initialize clients
-    control_client = boto3.client("bedrock-agentcore-control", region_name=region_name)
-    runtime_client = boto3.client(
-        "bedrock-agentcore",
-        region_name=region_name,
-        config=botocore.config.Config(read_timeout=900, connect_timeout=5),
+    control_client = _get_client(
+        "bedrock-agentcore-control", region_name, CONTROL_CLIENT_CONFIG
     )
+    runtime_client = _get_client("bedrock-agentcore", region_name, RUNTIME_CLIENT_CONFIG)
 
     # Look up agent ARN by name
     print(f"🔍 Looking up agent: {agent_runtime_name}")
-    response = control_client.list_agent_runtimes(maxResults=100)
-
-    agent_arn = None
-    for agent in response.get("agentRuntimes", []):
-        if agent.get("agentRuntimeName") == agent_runtime_name:
-            agent_arn = agent.get("agentRuntimeArn")
-            break
+    agent_arn = _lookup_agent_arn(control_client, agent_runtime_name, region_name)
 
     if not agent_arn:
         print(f"❌ Agent '{agent_runtime_name}' not found")
@@ -58,12 +129,14 @@ def invoke_agentcore(
 
     print(f"✅ Found agent: {agent_arn}\n")
 
-    # Generate session ID if not provided
+    # Reuse this agent's default session if not provided so the runtime stays warm
     if not session_id:
-        session_id = str(uuid.uuid4())
+        session_id = _DEFAULT_SESSION_IDS.setdefault(
+            (region_name, agent_runtime_name), str(uuid.uuid4())
+        )
 
     # Prepare payload
-    payload = json.dumps({"prompt": prompt}).encode()
+    payload = json_dumps_bytes({"prompt": prompt})
 
     # Invoke agent
     print(f"💬 Sending prompt: {prompt}\n")
@@ -79,42 +152,82 @@ def invoke_agentcore(
     # Stream response
     response_stream = response.get("response")
     if response_stream and hasattr(response_stream, "iter_lines"):
+        # Bind hot callables once for the per-token loop
+        loads = json_loads
+        write = sys.stdout.write
+        flush = sys.stdout.flush
+        pending = 0
         for line in response_stream.iter_lines(chunk_size=1024):
-            if line:
-                line_str = line.decode("utf-8").strip()
-                # Handle Server-Sent Events format
-                if line_str.startswith("data: "):
-                    data_content = line_str[6:]
-                    if data_content and data_content != "[DONE]":
-                        # Try to parse as JSON and extract text
-                        try:
-                            # First parse to get the outer JSON structure
-                            json_data = json.loads(data_content)
-
-                            # Handle different response formats
-                            if isinstance(json_data, dict):
-                                text = (
-                                    json_data.get("text")
-                                    or json_data.get("content")
-                                    or json_data.get("message")
-                                )
-                                if text:
-                                    print(text, end="", flush=True)
-                                else:
-                                    print(data_content, end="", flush=True)
-                            elif isinstance(json_data, str):
-                                # The response is a JSON-encoded string, print it directly
-                                # This handles the case where text comes as a string value
-                                # Add newline after tool usage markers
-                                if json_data.startswith("🔧 Using tool:"):
-                                    print(json_data, flush=True)
-                                else:
-                                    print(json_data, end="", flush=True)
-                            else:
-                                print(data_content, end="", flush=True)
-                        except json.JSONDecodeError:
-                            # Not valid JSON, print as-is
-                            print(data_content, end="", flush=True)
+            # Handle Server-Sent Events format, checking the prefix before decoding
+            if not line.startswith(b"data: "):
+                continue
+            data_content = line[6:].strip().decode("utf-8")
+            if not data_content or data_content == "[DONE]":
+                continue
+            # Try to parse as JSON and extract text
+            try:
+                # First parse to get the outer JSON structure
+                json_data = loads(data_content)
+
+                # Handle different response formats
+                if isinstance(json_data, dict):
+                    text = str(
+                        json_data.get("text")
+                        or json_data.get("content")
+                        or json_data.get("message")
+                        or data_content
+                    )
+                elif isinstance(json_data, str):
+                    # The response is a JSON-encoded string, print it directly
+                    # This handles the case where text comes as a string value
+                    # Add newline after tool usage markers
+                    if json_data.lstrip().startswith("🔧 Using tool:"):
+                        text = json_data + "\n"
+                    else:
+                        text = json_data
+                else:
+                    text = data_content
+            except ValueError:
+                # Not valid JSON, print as-is
+                text = data_content
+
+            # Flush on newlines or every few chunks rather than on every token
+            write(text)
+            pending += 1
+            if pending >= STREAM_FLUSH_CHUNKS or "\n" in text:
+                flush()
+                pending = 0
+
+        flush()
 
     print("\n" + "=" * 80)
     print(f"✅ Response complete (session: {session_id})")
+
+
+async def ainvoke_agentcore(
+    agent_runtime_name: str,
+    prompt: str,
+    session_id: Optional[str] = None,
+    region_name: Optional[str] = None,
+) -> None:
+    """
+    Async variant of invoke_agentcore() that streams on a worker thread.
+
+    Lets several agents be invoked concurrently, for example with
+    asyncio.gather() in a notebook cell, without blocking the event loop.
+    Calls without a session_id get a fresh session each, so concurrent
+    requests never interleave in one runtime session.
+
+    Example:
+        >>> await asyncio.gather(
+        ...     ainvoke_agentcore("agent_a", "First question", session_id=session_a),
+        ...     ainvoke_agentcore("agent_b", "Second question", session_id=session_b),
+        ... )
+    """
+    await asyncio.to_thread(
+        invoke_agentcore,
+        agent_runtime_name,
+        prompt,
+        session_id or str(uuid.uuid4()),
+        region_name,
+    )
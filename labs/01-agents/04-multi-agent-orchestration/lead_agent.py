@@ -1,20 +1,53 @@
 import asyncio
+import logging
 import os
+from typing import AsyncGenerator, Union
 
+import boto3
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
+from botocore.config import Config
 from strands import Agent, tool
 from strands.models import BedrockModel
+from strands.tools.executors import ConcurrentToolExecutor
 from strands.types.content import SystemContentBlock
 
 from strands_tools import editor
 
 from generate_report import generate_report_tool
 from lead_config import MODEL_ID, SYSTEM_PROMPT
-from pmc_research_agent import pmc_research_agent
+from pmc_research_agent import create_pmc_research_agent
+
+# Configure logging
+logging.basicConfig(
+    format="%(levelname)s | %(name)s | %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("lead_agent")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+# Set BEDROCK_LATENCY=optimized to use latency-optimized inference on supported models
+BEDROCK_LATENCY = os.getenv("BEDROCK_LATENCY", "standard")
+
+# Coalesce streamed text into fewer, larger chunks
+STREAM_FLUSH_CHUNKS = 32
+STREAM_FLUSH_SECONDS = 0.02
+
+# Shared boto3 session and tuned client config for the Bedrock runtime client
+BOTO_SESSION = boto3.Session()
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+    read_timeout=120,
+)
+
+# Limit how many research sub-agents run at once to avoid Bedrock throttling
+RESEARCH_CONCURRENCY = int(os.getenv("RESEARCH_CONCURRENCY", "4"))
+_RESEARCH_SEMAPHORE = asyncio.Semaphore(RESEARCH_CONCURRENCY)
 
 
 @tool
-def research_agent(prompt: str) -> str:
+async def research_agent(prompt: str) -> AsyncGenerator[Union[str, dict], None]:
     """
     AI agent for researching scientific questions using articles from PubMed Central (PMC).
 
@@ -26,8 +59,29 @@ def research_agent(prompt: str) -> str:
     Returns:
         Concise answer to the question based on the most relevant evidence, followed by a list of the associated `evidence_id` values for citation analysis.
     """
-    return pmc_research_agent(prompt)
-
+    # Each call gets its own sub-agent so parallel calls don't share history
+    result = None
+    async with _RESEARCH_SEMAPHORE:
+        async for event in create_pmc_research_agent().stream_async(prompt):
+            # Report sub-agent tool use as progress while the research runs
+            if message := event.get("message"):
+                for content in message.get("content", ()):
+                    if tool_use := content.get("toolUse"):
+                        yield f"\n🔧 Using tool: research_agent → {tool_use['name']}\n"
+            elif "result" in event:
+                result = event["result"]
+
+    # The last value yielded is the tool result
+    yield {"status": "success", "content": [{"text": str(result)}]}
+
+
+# Use uvloop for the runtime event loop when it is installed
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 app = BedrockAgentCoreApp()
 
@@ -39,6 +93,8 @@ system_content = [
 
 model = BedrockModel(
     model_id=MODEL_ID,
+    boto_session=BOTO_SESSION,
+    boto_client_config=BOTO_CONFIG,
     max_tokens=10000,
     cache_tools="default",
     temperature=1,
@@ -49,6 +105,7 @@ model = BedrockModel(
             "budget_tokens": 3000,
         },
     },
+    additional_args={"performanceConfig": {"latency": BEDROCK_LATENCY}},
 )
 
 os.environ["BYPASS_TOOL_CONSENT"] = "true"
@@ -57,6 +114,7 @@ agent = Agent(
     model=model,
     tools=[research_agent, generate_report_tool, editor],
     system_prompt=system_content,
+    tool_executor=ConcurrentToolExecutor(),
 )
 
 
@@ -66,23 +124,51 @@ async def strands_agent_bedrock(payload):
     Invoke the agent with a payload
     """
     user_input = payload.get("prompt")
-    print("User input:", user_input)
+    logger.info(f"User input: {user_input}")
+    loop = asyncio.get_running_loop()
+    buffer = []
+    last_flush = loop.time()
     try:
         async for event in agent.stream_async(user_input):
 
+            # Buffer event data; most events are text deltas, so check them first
+            if (data := event.get("data")) is not None:
+                buffer.append(data)
+
             # Print tool use
-            for content in event.get("message", {}).get("content", []):
-                if tool_use := content.get("toolUse"):
-                    yield "\n"
-                    yield f"🔧 Using tool: {tool_use['name']}"
-                    for k, v in tool_use["input"].items():
-                        yield f"**{k}**: {v}\n"
-                    yield "\n"
-
-            # Print event data
-            if "data" in event:
-                yield event["data"]
+            elif message := event.get("message"):
+                for content in message.get("content", ()):
+                    if tool_use := content.get("toolUse"):
+                        if buffer:
+                            yield "".join(buffer)
+                            buffer.clear()
+                        # Send the tool banner as a single frame
+                        args = "".join(
+                            f"**{k}**: {v}\n" for k, v in tool_use["input"].items()
+                        )
+                        yield f"\n🔧 Using tool: {tool_use['name']}\n{args}\n"
+
+            # Print research sub-agent progress
+            elif tool_stream := event.get("tool_stream_event"):
+                if isinstance(progress := tool_stream.get("data"), str):
+                    if buffer:
+                        yield "".join(buffer)
+                        buffer.clear()
+                    yield progress
+
+            # Flush buffered data in batches
+            if buffer and (
+                len(buffer) >= STREAM_FLUSH_CHUNKS
+                or loop.time() - last_flush > STREAM_FLUSH_SECONDS
+            ):
+                yield "".join(buffer)
+                buffer.clear()
+                last_flush = loop.time()
+        if buffer:
+            yield "".join(buffer)
     except Exception as e:
+        if buffer:
+            yield "".join(buffer)
         yield f"Error: {str(e)}"
 
 
@@ -1,18 +1,69 @@
-from database_tools import get_gateway_access_token, get_all_mcp_tools_from_mcp_client, tool_search, tools_to_strands_mcp_tools
-from utils import get_ssm_parameter
+from database_tools import get_cached_ssm_parameter, get_gateway_access_token, tool_search, tools_to_strands_mcp_tools
 from mcp.client.streamable_http import streamablehttp_client
 from strands import Agent
-from strands_tools import current_time
 from strands.models import BedrockModel
 from strands.tools.mcp import MCPClient
+from strands.types.content import SystemContentBlock
 from bedrock_agentcore.runtime import BedrockAgentCoreApp
+import asyncio
+import atexit
+import hashlib
+import logging
+import os
+import threading
 import time
-import uuid
+import boto3
+from botocore.config import Config
+from collections import OrderedDict
 from bedrock_agentcore.memory.integrations.strands.config import AgentCoreMemoryConfig
 from bedrock_agentcore.memory.integrations.strands.session_manager import AgentCoreMemorySessionManager
 
+# Configure logging
+logging.basicConfig(
+    format="%(levelname)s | %(name)s | %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger("agent")
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
 MAX_TOOLS=5
 
+# Reuse a session's last tool search for repeated prompts and acknowledgements
+TOOL_SEARCH_SKIP_PROMPTS = frozenset({
+    "hi", "hello", "hey", "thanks", "thank you", "thanks!", "thank you!",
+    "ok", "okay", "great", "got it", "cool", "yes", "no",
+})
+TOOL_SEARCH_CACHE_SIZE = 256
+_tool_search_cache = OrderedDict()
+
+# MCP client shared across invocations; replaced when the gateway token rotates
+# or an invocation fails. Each client counts the invocations using it and is
+# stopped only once it has been replaced and its last user has released it
+_mcp_client = None
+_mcp_client_key = None
+_mcp_client_users = {}
+_mcp_client_lock = threading.Lock()
+
+# Set BEDROCK_LATENCY=optimized to use latency-optimized inference on supported models
+BEDROCK_LATENCY = os.getenv("BEDROCK_LATENCY", "standard")
+
+# Coalesce streamed text into fewer, larger chunks
+STREAM_FLUSH_CHUNKS = 32
+STREAM_FLUSH_SECONDS = 0.02
+
+# Prefixes for the tool and reasoning frames
+TOOL_PREFIX = "\n\n🔧 Using tool: "
+REASONING_PREFIX = "\n\n🔧 Reasoning: "
+
+# Shared boto3 session and tuned client config for the Bedrock runtime client
+BOTO_SESSION = boto3.Session()
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 3, "mode": "adaptive"},
+    tcp_keepalive=True,
+    read_timeout=120,
+)
+
 SYSTEM_PROMPT = """
     You are a Healthcare Research Infrastructure Assistant specializing in AWS-powered life sciences solutions.
 
@@ -35,119 +86,265 @@ GUIDELINES:
 
 Be concise, technical, and always ground recommendations in both AWS best practices and real research context.
 
-    """
+    """.strip()
+
+# Use uvloop for the runtime event loop when it is installed
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 app = BedrockAgentCoreApp()
 
+# Define system content with cache points
+system_content = [
+    SystemContentBlock(text=SYSTEM_PROMPT),
+    SystemContentBlock(cachePoint={"type": "default"}),
+]
 
-@app.entrypoint
-async def strands_agent_bedrock(payload, context):
-    
-    """Create and run agent for each invocation"""
+# Model is shared across invocations; only the tools and session are per request
+model = BedrockModel(
+    model_id="global.anthropic.claude-sonnet-4-6",
+    boto_session=BOTO_SESSION,
+    boto_client_config=BOTO_CONFIG,
+    max_tokens=10000,
+    cache_tools="default",
+    additional_request_fields={
+        "anthropic_beta": ["interleaved-thinking-2025-05-14"],
+        "thinking": {"type": "enabled", "budget_tokens": 8000},
+    },
+    additional_args={"performanceConfig": {"latency": BEDROCK_LATENCY}},
+)
 
-    # Create model
-    model = BedrockModel(
-        model_id="global.anthropic.claude-sonnet-4-6",
-        max_tokens=10000,
-        additional_request_fields={
-            "anthropic_beta": ["interleaved-thinking-2025-05-14"],
-            "thinking": {"type": "enabled", "budget_tokens": 8000},
-        },
-    )
-    # Get gateway access token
+
+def get_memory_id():
+    """Return the AgentCore memory id parsed from the cached memory ARN in SSM"""
+    return get_cached_ssm_parameter("/deep-research-workshop/agentcore/memory_id").rsplit("/", 1)[-1]
+
+
+def get_gateway_config():
+    """Return the gateway access token, gateway endpoint and memory id from their caches"""
     jwt_token = get_gateway_access_token()
-    if not jwt_token:
-        print("❌ Failed to get gateway access token")
-        
-    # Get gateway endpoint
-    gateway_endpoint = get_ssm_parameter("/deep-research-workshop/agentcore/gateway_url")
-    print(f"Gateway Endpoint - MCP URL: {gateway_endpoint}")
-
-    # Create MCP client
-    client = MCPClient(
-        lambda: streamablehttp_client(
-            gateway_endpoint, headers={"Authorization": f"Bearer {jwt_token}"}
+    gateway_endpoint = get_cached_ssm_parameter("/deep-research-workshop/agentcore/gateway_url")
+    return jwt_token, gateway_endpoint, get_memory_id()
+
+
+# Resolve the gateway config once at startup so invocations read it from the caches
+try:
+    get_cached_ssm_parameter("/deep-research-workshop/agentcore/gateway_url")
+    get_memory_id()
+except Exception as e:
+    logger.warning(f"Could not preload gateway config: {e}")
+
+
+def _stop_mcp_client(client):
+    try:
+        client.stop(None, None, None)
+    except Exception as e:
+        logger.warning(f"Error during client cleanup: {e}")
+
+
+def _retire_mcp_client():
+    """Detach the shared MCP client and return it if no invocation is using it"""
+    global _mcp_client, _mcp_client_key
+    client, _mcp_client, _mcp_client_key = _mcp_client, None, None
+    if client is not None and _mcp_client_users.get(client) == 0:
+        del _mcp_client_users[client]
+        return client
+    return None
+
+
+def acquire_mcp_client(gateway_endpoint, jwt_token):
+    """Return a started MCP client for the gateway, reusing it while the token is unchanged.
+    Every call must be paired with release_mcp_client"""
+    global _mcp_client, _mcp_client_key
+    key = (gateway_endpoint, hashlib.blake2b(jwt_token.encode(), digest_size=16).digest())
+    with _mcp_client_lock:
+        if _mcp_client is not None and _mcp_client_key == key:
+            _mcp_client_users[_mcp_client] += 1
+            return _mcp_client
+        idle_client = _retire_mcp_client()
+        if idle_client is not None:
+            _stop_mcp_client(idle_client)
+        # Built once per token so reconnects reuse the same headers
+        headers = {"Authorization": f"Bearer {jwt_token}"}
+        client = MCPClient(
+            lambda: streamablehttp_client(gateway_endpoint, headers=headers)
         )
-    )
+        client.start()
+        _mcp_client, _mcp_client_key = client, key
+        _mcp_client_users[client] = 1
+        return client
+
 
-    # Configure memory
-    mem_arn = get_ssm_parameter("/deep-research-workshop/agentcore/memory_id")
-    mem_id = mem_arn.split("/")[-1]
+def release_mcp_client(client, failed=False):
+    """Release an invocation's MCP client. A failed invocation retires the client,
+    so a dead gateway session is replaced on the next invocation"""
+    with _mcp_client_lock:
+        if failed and client is _mcp_client:
+            _retire_mcp_client()
+        _mcp_client_users[client] -= 1
+        stop = client is not _mcp_client and _mcp_client_users[client] == 0
+        if stop:
+            del _mcp_client_users[client]
+    if stop:
+        _stop_mcp_client(client)
 
-    print(f"Received event: {payload}")
 
+@atexit.register
+def _stop_mcp_clients():
+    """Stop the open MCP clients when the runtime shuts down"""
+    with _mcp_client_lock:
+        clients = list(_mcp_client_users)
+        _mcp_client_users.clear()
+    for client in clients:
+        _stop_mcp_client(client)
+
+
+@app.entrypoint
+async def strands_agent_bedrock(payload, context):
+    
+    """Create and run agent for each invocation"""
+
+    logger.debug(f"Received event: {payload}")
+
+    # Validate the request before any network calls
     user_input = payload.get("prompt")
     actor_id = payload.get("actor_id", "DEFAULT")
     session_id = context.session_id
-    print(f"actor id: {actor_id}")
-    print(f"session id: {session_id}")
-    print(f"mem id: {mem_id}")
     if not session_id:
         raise Exception("Context session_id is not set")
-    
+    if not user_input:
+        raise Exception("Payload prompt is not set")
+
+    # Token refreshes and expired SSM entries make blocking HTTP calls, so
+    # resolve the gateway config in one worker thread off the event loop
+    jwt_token, gateway_endpoint, mem_id = await asyncio.to_thread(get_gateway_config)
+    if not jwt_token:
+        logger.error("❌ Failed to get gateway access token")
+        raise Exception("Failed to get gateway access token")
+    logger.info(f"Gateway Endpoint - MCP URL: {gateway_endpoint}")
+    logger.debug(f"actor id: {actor_id}, session id: {session_id}, mem id: {mem_id}")
+
     agentcore_memory_config = AgentCoreMemoryConfig(
         memory_id=mem_id,
         session_id=session_id,
         actor_id=actor_id
     )
         
-    session_manager = AgentCoreMemorySessionManager(
-        agentcore_memory_config=agentcore_memory_config
+    # Skip the gateway search when the prompt repeats this session's last
+    # searched prompt or is an acknowledgement such as "thanks"
+    query_hash = hashlib.blake2b(user_input.encode(), digest_size=16).digest()
+    cached_search = _tool_search_cache.get(session_id)
+    reuse_tools = cached_search is not None and (
+        cached_search[0] == query_hash
+        or user_input.strip().lower() in TOOL_SEARCH_SKIP_PROMPTS
     )
 
-    
-
-    client.start()
     # Use semantic tool search 
     search_query_to_use = user_input
-    print(f"\n🔍 Searching for tools with query: '{search_query_to_use}'")
-                
+    if reuse_tools:
+        logger.info("🔍 Reusing tools from the previous search in this session")
+        search = asyncio.sleep(0, result=cached_search[1])
+    else:
+        logger.info(f"🔍 Searching for tools with query: '{search_query_to_use}'")
+        search = asyncio.to_thread(
+            tool_search, gateway_endpoint, jwt_token, search_query_to_use, max_tools=MAX_TOOLS
+        )
+
+    # Tool search, MCP client setup and memory setup are independent blocking
+    # calls, so run them concurrently off the event loop
     start_time = time.time()
-    tools_found = tool_search(gateway_endpoint, jwt_token, search_query_to_use, max_tools=MAX_TOOLS)
+    tools_found, client, session_manager = await asyncio.gather(
+        search,
+        asyncio.to_thread(acquire_mcp_client, gateway_endpoint, jwt_token),
+        asyncio.to_thread(
+            AgentCoreMemorySessionManager,
+            agentcore_memory_config=agentcore_memory_config,
+        ),
+        return_exceptions=True,
+    )
     search_time = time.time() - start_time
+    if isinstance(client, BaseException):
+        raise client
+
+    # Release the MCP client when the stream ends, also when the search or memory setup failed
+    failed = False
+    try:
+        for result in (tools_found, session_manager):
+            if isinstance(result, BaseException):
+                raise result
+
+        if tools_found and not reuse_tools:
+            _tool_search_cache[session_id] = (query_hash, tools_found)
+            _tool_search_cache.move_to_end(session_id)
+            if len(_tool_search_cache) > TOOL_SEARCH_CACHE_SIZE:
+                _tool_search_cache.popitem(last=False)
                 
-    if not tools_found:
-        print("❌ No tools found from search")
-                    
-    print(f"✅ Found {len(tools_found)} relevant tools in {search_time:.2f}s")
-    print(f"Top tool: {tools_found[0]['name']}")
+        if not tools_found:
+            logger.warning("❌ No tools found from search")
+        else:
+            logger.info(f"✅ Found {len(tools_found)} relevant tools in {search_time:.2f}s")
+            logger.info(f"Top tool: {tools_found[0]['name']}")
                 
-    agent_tools = tools_to_strands_mcp_tools(tools_found, MAX_TOOLS, client)
-    agent = Agent(system_prompt=SYSTEM_PROMPT,model=model, tools=agent_tools, session_manager=session_manager)
+        agent_tools = tools_to_strands_mcp_tools(tools_found, MAX_TOOLS, client)
+        agent = Agent(system_prompt=system_content,model=model, tools=agent_tools, session_manager=session_manager)
 
-    print("User input:", user_input)
-    # Stream response
-    tool_name = None
-    try:
-        async for event in agent.stream_async(user_input):
-            if (
-                "current_tool_use" in event
-                and event["current_tool_use"].get("name") != tool_name
-            ):
-                tool_name = event["current_tool_use"]["name"]
-                yield f"\n\n🔧 Using tool: {tool_name}\n\n"
-            elif "message" in event and "content" in event["message"]:
-                for obj in event["message"]["content"]:
-                    if "toolResult" in obj:
-                        pass  # Skip tool result display
-                    elif "reasoningContent" in obj:
-                        reasoning_text = obj["reasoningContent"]["reasoningText"]["text"]
-                        yield f"\n\n🔧 Reasoning: {reasoning_text}\n\n"
-            if "data" in event:
-                tool_name = None
-                yield event["data"]
-    except Exception as e:
-        yield f"Error processing request: {str(e)}"
-    finally:
-        #client.close()
+        logger.info(f"User input: {user_input}")
+        # Stream response
+        loop = asyncio.get_running_loop()
+        buffer = []
+        last_flush = loop.time()
+        tool_name = None
         try:
-            client.close()
-        except AttributeError:
-            # MCPClient might not have close method in this version
-            pass
+            async for event in agent.stream_async(user_input):
+
+                # Buffer event data; most events are text deltas, so check them first
+                if (data := event.get("data")) is not None:
+                    tool_name = None
+                    buffer.append(data)
+
+                elif (current_tool_use := event.get("current_tool_use")) is not None:
+                    name = current_tool_use.get("name")
+                    # Partial tool-use events may not carry a name yet
+                    if name and name != tool_name:
+                        tool_name = name
+                        if buffer:
+                            yield "".join(buffer)
+                            buffer.clear()
+                        yield TOOL_PREFIX + tool_name + "\n\n"
+
+                elif message := event.get("message"):
+                    for obj in message.get("content", ()):
+                        # Tool results are not displayed
+                        try:
+                            reasoning_text = obj["reasoningContent"]["reasoningText"]["text"]
+                        except KeyError:
+                            continue
+                        if buffer:
+                            yield "".join(buffer)
+                            buffer.clear()
+                        yield REASONING_PREFIX + reasoning_text + "\n\n"
+
+                # Flush buffered data in batches
+                if buffer and (
+                    len(buffer) >= STREAM_FLUSH_CHUNKS
+                    or loop.time() - last_flush > STREAM_FLUSH_SECONDS
+                ):
+                    yield "".join(buffer)
+                    buffer.clear()
+                    last_flush = loop.time()
+            if buffer:
+                yield "".join(buffer)
         except Exception as e:
-            print(f"Warning: Error during client cleanup: {e}")
-        
+            failed = True
+            if buffer:
+                yield "".join(buffer)
+            yield f"Error processing request: {str(e)}"
+    finally:
+        release_mcp_client(client, failed)
 
 
 if __name__ == "__main__":
@@ -3,17 +3,25 @@
 
 import logging
 import os
-import re
+import threading
+import time
+from collections import OrderedDict
 import boto3
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Any, Dict, List, Literal
-from utils import get_ssm_parameter
+from urllib3.util.retry import Retry
+from utils import get_ssm_parameter, get_ssm_parameters
 from strands.tools.mcp import MCPClient, MCPAgentTool
 from mcp.types import Tool as MCPTool
 from mcp.client.streamable_http import streamablehttp_client
 
 # Global configuration for commercial use filtering
-COMMERCIAL_USE_ONLY = os.getenv("COMMERCIAL_USE_ONLY", True)
+COMMERCIAL_USE_ONLY = os.getenv("COMMERCIAL_USE_ONLY", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
 
 # Configure logging
 logging.basicConfig(
@@ -24,32 +32,112 @@ logging.basicConfig(
 logger = logging.getLogger("search_database_tools")
 logger.setLevel(logging.INFO)
 
+# Refresh the cached gateway token this many seconds before it expires
+TOKEN_REFRESH_MARGIN_SECONDS = 60
+_token_cache = {"access_token": None, "expires_at": 0.0}
+_token_request_config = {"value": None, "expires_at": 0.0}
+_token_lock = threading.Lock()
+
+# Static parts of the gateway semantic search request
+_SEARCH_TOOL_NAME = "x_amz_bedrock_agentcore_search"
+_RPC_CALL_TEMPLATE = {"jsonrpc": "2.0", "id": 2, "method": "tools/call"}
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Exact-match tool search results, reused for a few minutes across requests
+TOOL_SEARCH_CACHE_TTL = float(os.getenv("TOOL_SEARCH_CACHE_TTL", "300"))
+TOOL_SEARCH_CACHE_SIZE = 512
+_tool_search_cache = OrderedDict()
+_tool_search_lock = threading.Lock()
+
+# Pooled HTTP session so Cognito and gateway calls reuse TLS connections.
+# Both POSTs are read-only (token issue and tool search), so retrying them is safe.
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["POST"]),
+            raise_on_status=False,
+        ),
+    ),
+)
+
+
+# The gateway agent reuses its SSM parameters for this many seconds
+GATEWAY_SSM_CACHE_TTL = float(os.getenv("GATEWAY_SSM_CACHE_TTL", "300"))
+
+# SSM parameters the gateway agent reads, fetched together in one request
+GATEWAY_SSM_PARAMETERS = (
+    "/deep-research-workshop/agentcore/machine_client_id",
+    "/deep-research-workshop/agentcore/cognito_secret",
+    "/deep-research-workshop/agentcore/cognito_domain",
+    "/deep-research-workshop/agentcore/userpool_id",
+    "/deep-research-workshop/agentcore/gateway_url",
+    "/deep-research-workshop/agentcore/memory_id",
+)
+
+
+def get_cached_ssm_parameter(name: str) -> str:
+    """Get an SSM parameter cached for GATEWAY_SSM_CACHE_TTL, fetching all gateway parameters together on a miss."""
+    if name in GATEWAY_SSM_PARAMETERS:
+        values = get_ssm_parameters(
+            list(GATEWAY_SSM_PARAMETERS), cache_ttl=GATEWAY_SSM_CACHE_TTL
+        )
+        if name not in values:
+            raise ValueError(f"SSM parameter not found: {name}")
+        return values[name]
+    return get_ssm_parameter(name, cache_ttl=GATEWAY_SSM_CACHE_TTL)
+
+
+def _get_token_request_config():
+    """Get the Cognito token URL, client credentials and scopes, refreshed with the gateway SSM cache TTL."""
+    if _token_request_config["value"] and time.monotonic() < _token_request_config["expires_at"]:
+        return _token_request_config["value"]
+
+    machine_client_id = get_cached_ssm_parameter("/deep-research-workshop/agentcore/machine_client_id")
+    machine_client_secret = get_cached_ssm_parameter("/deep-research-workshop/agentcore/cognito_secret")
+    cognito_domain = get_cached_ssm_parameter("/deep-research-workshop/agentcore/cognito_domain")
+    user_pool_id = get_cached_ssm_parameter("/deep-research-workshop/agentcore/userpool_id")
+
+    # Clean the domain
+    cognito_domain = cognito_domain.strip()
+    if cognito_domain.startswith("https://"):
+        cognito_domain = cognito_domain[8:]
+
+    # Get resource server scopes
+    cognito_client = boto3.client('cognito-idp')
+    response = cognito_client.list_resource_servers(UserPoolId=user_pool_id, MaxResults=1)
+
+    if response['ResourceServers']:
+        resource_server_id = response['ResourceServers'][0]['Identifier']
+        scopes = f"{resource_server_id}/read"
+    else:
+        scopes = "gateway:read gateway:write"
+
+    token_url = f"https://{cognito_domain}/oauth2/token"
+    value = (token_url, machine_client_id, machine_client_secret, scopes)
+    _token_request_config.update(value=value, expires_at=time.monotonic() + GATEWAY_SSM_CACHE_TTL)
+    return value
+
+
 def get_gateway_access_token():
-    """Get M2M bearer token for gateway authentication."""
+    """Get M2M bearer token for gateway authentication, reusing it until it nears expiry."""
+    with _token_lock:
+        if (
+            _token_cache["access_token"]
+            and time.time() < _token_cache["expires_at"] - TOKEN_REFRESH_MARGIN_SECONDS
+        ):
+            return _token_cache["access_token"]
+
     try:
-        # Get credentials from SSM
-        machine_client_id = get_ssm_parameter("/deep-research-workshop/agentcore/machine_client_id")
-        machine_client_secret = get_ssm_parameter("/deep-research-workshop/agentcore/cognito_secret")
-        cognito_domain = get_ssm_parameter("/deep-research-workshop/agentcore/cognito_domain")
-        user_pool_id = get_ssm_parameter("/deep-research-workshop/agentcore/userpool_id")
-
-        # Clean the domain
-        cognito_domain = cognito_domain.strip()
-        if cognito_domain.startswith("https://"):
-            cognito_domain = cognito_domain[8:]
-
-        # Get resource server scopes
-        cognito_client = boto3.client('cognito-idp')
-        response = cognito_client.list_resource_servers(UserPoolId=user_pool_id, MaxResults=1)
-        
-        if response['ResourceServers']:
-            resource_server_id = response['ResourceServers'][0]['Identifier']
-            scopes = f"{resource_server_id}/read"
-        else:
-            scopes = "gateway:read gateway:write"
+        token_url, machine_client_id, machine_client_secret, scopes = _get_token_request_config()
 
         # M2M OAuth flow
-        token_url = f"https://{cognito_domain}/oauth2/token"
         token_data = {
             "grant_type": "client_credentials",
             "client_id": machine_client_id,
@@ -57,7 +145,7 @@ def get_gateway_access_token():
             "scope": scopes
         }
         
-        response = requests.post(
+        response = _HTTP_SESSION.post(
             token_url, 
             data=token_data, 
             headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -68,57 +156,65 @@ def get_gateway_access_token():
             print(f"Failed to get access token: {response.text}")
             return None
             
-        access_token = response.json()["access_token"]
+        token_response = response.json()
+        access_token = token_response["access_token"]
+        with _token_lock:
+            _token_cache["access_token"] = access_token
+            _token_cache["expires_at"] = time.time() + int(token_response.get("expires_in", 3600))
         return access_token
         
     except Exception as e:
         print(f"Error getting M2M bearer token: {str(e)}")
         return None
 
-def get_all_mcp_tools_from_mcp_client(client):
-    """Get all tools from MCP client with pagination."""
-    more_tools = True
-    tools = []
+def iter_all_mcp_tools(client):
+    """Yield tools from MCP client one page at a time."""
     pagination_token = None
-    while more_tools:
-        tmp_tools = client.list_tools_sync(pagination_token=pagination_token)
-        tools.extend(tmp_tools)
-        if tmp_tools.pagination_token is None:
-            more_tools = False
-        else:
-            more_tools = True
-            pagination_token = tmp_tools.pagination_token
-    return tools
+    while True:
+        tools = client.list_tools_sync(pagination_token=pagination_token)
+        yield from tools
+        if tools.pagination_token is None:
+            return
+        pagination_token = tools.pagination_token
+
+def get_all_mcp_tools_from_mcp_client(client):
+    """Get all tools from MCP client with pagination.
+
+    Lists the whole gateway catalog, so keep it off the request path; agents
+    should use tool_search, or itertools.islice over iter_all_mcp_tools.
+    """
+    return list(iter_all_mcp_tools(client))
 
 def tool_search(gateway_endpoint, jwt_token, query, max_tools=5):
     """Search for tools using the gateway's semantic search."""
-    tool_params = {
-        "name": "x_amz_bedrock_agentcore_search",
-        "arguments": {"query": query},
-    }
-    
+    cache_key = (gateway_endpoint, query, max_tools)
+    with _tool_search_lock:
+        cached = _tool_search_cache.get(cache_key)
+        if cached is not None and time.monotonic() < cached[1]:
+            _tool_search_cache.move_to_end(cache_key)
+            return list(cached[0])
+
     request_body = {
-        "jsonrpc": "2.0",
-        "id": 2,
-        "method": "tools/call",
-        "params": tool_params,
+        **_RPC_CALL_TEMPLATE,
+        "params": {"name": _SEARCH_TOOL_NAME, "arguments": {"query": query}},
     }
     
-    response = requests.post(
+    response = _HTTP_SESSION.post(
         gateway_endpoint,
         json=request_body,
-        headers={
-            "Authorization": f"Bearer {jwt_token}",
-            "Content-Type": "application/json",
-        },
+        headers={**_JSON_HEADERS, "Authorization": f"Bearer {jwt_token}"},
         timeout=30
     )
     
     if response.status_code == 200:
-        tool_resp = response.json()
-        tools = tool_resp["result"]["structuredContent"]["tools"]
-        tools = tools[:max_tools]
-        return tools
+        tools = response.json()["result"]["structuredContent"]["tools"][:max_tools]
+        if tools:
+            with _tool_search_lock:
+                _tool_search_cache[cache_key] = (tools, time.monotonic() + TOOL_SEARCH_CACHE_TTL)
+                _tool_search_cache.move_to_end(cache_key)
+                if len(_tool_search_cache) > TOOL_SEARCH_CACHE_SIZE:
+                    _tool_search_cache.popitem(last=False)
+        return list(tools)
     else:
         print(f"Search failed: {response.text}")
         return []
@@ -1,23 +1,107 @@
+import functools
 import boto3
 import json
 import yaml
 import os
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, Optional
 import requests
 
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlSafeLoader
 
-def get_ssm_parameter(name: str, with_decryption: bool = True) -> str:
-    ssm = boto3.client("ssm")
+
+# SSM parameter values are reused for cache_ttl seconds, defaulting to
+# SSM_CACHE_TTL; the default of 0 always reads SSM so notebooks see parameters as
+# soon as they are written. Writes and deletes made through this module drop the
+# cached value
+SSM_CACHE_TTL = float(os.getenv("SSM_CACHE_TTL", "0"))
+_SSM_CACHE: Dict[tuple, tuple] = {}
+_SSM_CACHE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _get_client(service_name: str):
+    return boto3.client(service_name)
+
+
+def _cache_ssm_parameter(
+    name: str, with_decryption: bool, value: Optional[str], cache_ttl: float
+) -> None:
+    with _SSM_CACHE_LOCK:
+        _SSM_CACHE[(name, with_decryption)] = (value, time.monotonic() + cache_ttl)
+
+
+def _invalidate_ssm_parameter(name: str) -> None:
+    with _SSM_CACHE_LOCK:
+        _SSM_CACHE.pop((name, True), None)
+        _SSM_CACHE.pop((name, False), None)
+
+
+def get_ssm_parameter(
+    name: str, with_decryption: bool = True, cache_ttl: Optional[float] = None
+) -> str:
+    cache_ttl = SSM_CACHE_TTL if cache_ttl is None else cache_ttl
+    if cache_ttl > 0:
+        with _SSM_CACHE_LOCK:
+            cached = _SSM_CACHE.get((name, with_decryption))
+        if cached is not None and cached[0] is not None and time.monotonic() < cached[1]:
+            return cached[0]
+
+    ssm = _get_client("ssm")
 
     response = ssm.get_parameter(Name=name, WithDecryption=with_decryption)
 
-    return response["Parameter"]["Value"]
+    value = response["Parameter"]["Value"]
+    if cache_ttl > 0:
+        _cache_ssm_parameter(name, with_decryption, value, cache_ttl)
+    return value
+
+
+def get_ssm_parameters(
+    names: list, with_decryption: bool = True, cache_ttl: Optional[float] = None
+) -> Dict[str, str]:
+    cache_ttl = SSM_CACHE_TTL if cache_ttl is None else cache_ttl
+    # Serve fresh values from the cache and fetch only the rest; a cached None
+    # marks a name SSM reported as invalid
+    values = {}
+    known_invalid = set()
+    if cache_ttl > 0:
+        now = time.monotonic()
+        with _SSM_CACHE_LOCK:
+            for name in names:
+                cached = _SSM_CACHE.get((name, with_decryption))
+                if cached is not None and now < cached[1]:
+                    if cached[0] is None:
+                        known_invalid.add(name)
+                    else:
+                        values[name] = cached[0]
+    missing = [name for name in names if name not in values and name not in known_invalid]
+    if not missing:
+        return values
+
+    ssm = _get_client("ssm")
+
+    response = ssm.get_parameters(Names=missing, WithDecryption=with_decryption)
+
+    for parameter in response["Parameters"]:
+        values[parameter["Name"]] = parameter["Value"]
+        if cache_ttl > 0:
+            _cache_ssm_parameter(parameter["Name"], with_decryption, parameter["Value"], cache_ttl)
+    if cache_ttl > 0:
+        for name in response.get("InvalidParameters", []):
+            _cache_ssm_parameter(name, with_decryption, None, cache_ttl)
+    return values
 
 
 def put_ssm_parameter(
     name: str, value: str, parameter_type: str = "String", with_encryption: bool = False
 ) -> None:
-    ssm = boto3.client("ssm")
+    ssm = _get_client("ssm")
 
     put_params = {
         "Name": name,
@@ -30,14 +114,16 @@ def put_ssm_parameter(
         put_params["Type"] = "SecureString"
 
     ssm.put_parameter(**put_params)
+    _invalidate_ssm_parameter(name)
 
 
 def delete_ssm_parameter(name: str) -> None:
-    ssm = boto3.client("ssm")
+    ssm = _get_client("ssm")
     try:
         ssm.delete_parameter(Name=name)
     except ssm.exceptions.ParameterNotFound:
         pass
+    _invalidate_ssm_parameter(name)
 
 
 def load_api_spec(file_path: str) -> list:
@@ -48,18 +134,19 @@ def load_api_spec(file_path: str) -> list:
     return data
 
 
+@functools.lru_cache(maxsize=1)
 def get_aws_region() -> str:
     session = boto3.session.Session()
     return session.region_name
 
 
 def get_aws_account_id() -> str:
-    sts = boto3.client("sts")
+    sts = _get_client("sts")
     return sts.get_caller_identity()["Account"]
 
 
 def get_cognito_client_secret() -> str:
-    client = boto3.client("cognito-idp")
+    client = _get_client("cognito-idp")
     response = client.describe_user_pool_client(
         UserPoolId=get_ssm_parameter("/deep-research-workshop/agentcore/userpool_id"),
         ClientId=get_ssm_parameter("/deep-research-workshop/agentcore/machine_client_id"),
@@ -81,7 +168,7 @@ def get_gateway_access_token():
             cognito_domain = cognito_domain[8:]
 
         # Get resource server scopes
-        cognito_client = boto3.client('cognito-idp')
+        cognito_client = _get_client('cognito-idp')
         response = cognito_client.list_resource_servers(UserPoolId=user_pool_id, MaxResults=1)
         
         if response['ResourceServers']:
@@ -144,24 +231,28 @@ def read_config(file_path: str) -> Dict[str, Any]:
             if ext == ".json":
                 return json.load(file)
             elif ext in [".yaml", ".yml"]:
-                return yaml.safe_load(file)
+                return yaml.load(file, Loader=_YamlSafeLoader)
             else:
-                # Try to auto-detect format by attempting JSON first, then YAML
+                # Try to auto-detect format; only content that opens with an
+                # object or array can be JSON, everything else goes to YAML
                 content = file.read()
-                file.seek(0)
+                first = next((c for c in content if not c.isspace()), "")
 
                 # Try JSON first
-                try:
-                    return json.loads(content)
-                except json.JSONDecodeError:
-                    # Try YAML
+                if first in ("{", "["):
                     try:
-                        return yaml.safe_load(content)
-                    except yaml.YAMLError:
-                        raise ValueError(
-                            f"Unsupported configuration file format: {ext}. "
-                            f"Supported formats: .json, .yaml, .yml"
-                        )
+                        return json.loads(content)
+                    except json.JSONDecodeError:
+                        pass
+
+                # Try YAML
+                try:
+                    return yaml.load(content, Loader=_YamlSafeLoader)
+                except yaml.YAMLError:
+                    raise ValueError(
+                        f"Unsupported configuration file format: {ext}. "
+                        f"Supported formats: .json, .yaml, .yml"
+                    )
 
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in configuration file {file_path}: {e}")